@@ -75,6 +75,7 @@ class Settings(BaseSettings):
     sse_max_connections_per_user: int = Field(default=1000)
     sse_event_buffer_size: int = Field(default=100)
     sse_event_ttl: int = Field(default=300)
+    sse_use_redis_buffer: bool = Field(default=True)  # False: in-process buffer (single worker)
 
     # Agent Bus
     agent_max_concurrency: int = Field(default=3)
@@ -3,13 +3,15 @@
 import asyncio
 import json
 import logging
-from collections import defaultdict
-from datetime import datetime, timezone
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
 from redis.asyncio import Redis
 
+from app.config import settings
 from app.schemas.event import StreamEvent, StreamEventType
 
 logger = logging.getLogger(__name__)
@@ -23,10 +25,19 @@ class StreamConnection:
         self.user_id = user_id
         self.queue = queue
         self.connected_at = datetime.now(timezone.utc)
-        self.last_heartbeat = datetime.now(timezone.utc)
+        # Monotonic seconds; see last_heartbeat_at for wall-clock time
+        self._connected_monotonic = time.monotonic()
+        self.last_heartbeat = self._connected_monotonic
+
+    @property
+    def last_heartbeat_at(self) -> datetime:
+        """Wall-clock time of the last heartbeat (for logging)."""
+        return self.connected_at + timedelta(
+            seconds=self.last_heartbeat - self._connected_monotonic
+        )
 
-    async def send_event(self, event: StreamEvent) -> bool:
-        """Send event to this connection."""
+    async def send_event(self, event: StreamEvent | bytes) -> bool:
+        """Send event (or its pre-serialized NDJSON line) to this connection."""
         try:
             await self.queue.put(event)
             return True
@@ -43,7 +54,7 @@ class StreamConnection:
                 session_id=self.session_id,
             )
             await self.queue.put(heartbeat_event)
-            self.last_heartbeat = datetime.now(timezone.utc)
+            self.last_heartbeat = time.monotonic()
             return True
         except Exception as e:
             logger.error(f"Failed to send heartbeat: {e}")
@@ -60,12 +71,20 @@ class StreamManager:
     CONNECTION_TIMEOUT = 300  # 5 minutes
     MAX_EVENT_SIZE = 10240  # 10KB
 
-    def __init__(self, redis: Redis):
+    def __init__(self, redis: Redis, use_redis_buffer: bool = True):
         self.redis = redis
+        # Redis buffer is shared between workers; the local one is not
+        self.use_redis_buffer = use_redis_buffer
         # connections[session_id] = [StreamConnection, ...]
         self.connections: dict[UUID, list[StreamConnection]] = defaultdict(list)
         # user_sessions[user_id] = {session_id, ...}
         self.user_sessions: dict[UUID, set[UUID]] = defaultdict(set)
+        # _local_buffer[session_id] = deque of serialized events, newest first
+        self._local_buffer: dict[UUID, deque[bytes]] = defaultdict(
+            lambda: deque(maxlen=self.MAX_BUFFER_SIZE)
+        )
+        # _local_buffer_expiry[session_id] = monotonic deadline
+        self._local_buffer_expiry: dict[UUID, float] = {}
         self._heartbeat_task: asyncio.Task | None = None
         self._lock = asyncio.Lock()
 
@@ -95,13 +114,19 @@ class StreamManager:
                         pass
             self.connections.clear()
             self.user_sessions.clear()
+            self._local_buffer.clear()
+            self._local_buffer_expiry.clear()
 
         logger.info("Stream Manager stopped")
 
     async def register_connection(
         self, session_id: UUID, user_id: UUID, since: datetime | None = None
     ) -> asyncio.Queue:
-        """Register new streaming connection."""
+        """Register new streaming connection.
+
+        Buffered events are replayed into the returned queue before this
+        coroutine returns, so callers can read them immediately.
+        """
         queue = asyncio.Queue(maxsize=1000)
         connection = StreamConnection(session_id, user_id, queue)
 
@@ -153,23 +178,17 @@ class StreamManager:
         Args:
             session_id: Session UUID
             event: Event to broadcast
-            buffer: Whether to buffer event in Redis
+            buffer: Whether to buffer event for reconnection recovery
             
         Returns:
             Number of connections that received the event
         """
-        # Validate event size
-        event_json = event.model_dump_json()
-        if len(event_json) > self.MAX_EVENT_SIZE:
-            logger.warning(
-                f"Event size {len(event_json)} exceeds max size {self.MAX_EVENT_SIZE}, "
-                "truncating payload"
-            )
-            event.payload = {"error": "Payload too large, fetch via API"}
+        # Serialize once; every connection receives the same NDJSON line
+        data = self._serialize_for_broadcast(event)
 
         # Buffer event in Redis if requested
         if buffer:
-            await self._buffer_event(session_id, event)
+            await self._buffer_event(session_id, event, data)
 
         # Broadcast to all connections
         sent_count = 0
@@ -177,7 +196,7 @@ class StreamManager:
             connections = self.connections.get(session_id, [])
 
         for conn in connections:
-            if await conn.send_event(event):
+            if await conn.send_event(data):
                 sent_count += 1
 
         logger.debug(
@@ -196,13 +215,28 @@ class StreamManager:
         Returns:
             Total number of connections that received the event
         """
-        total_sent = 0
+        # Serialize once for all sessions of the user
+        data = self._serialize_for_broadcast(event)
+
         async with self._lock:
-            session_ids = list(self.user_sessions.get(user_id, set()))
+            targets = [
+                (session_id, self.connections.get(session_id, []))
+                for session_id in self.user_sessions.get(user_id, ())
+            ]
 
-        for session_id in session_ids:
-            sent = await self.broadcast_event(session_id, event, buffer)
-            total_sent += sent
+        total_sent = 0
+        for session_id, connections in targets:
+            if buffer:
+                await self._buffer_event(session_id, event, data)
+
+            for conn in connections:
+                if await conn.send_event(data):
+                    total_sent += 1
+
+        logger.debug(
+            f"Event broadcasted to user: user={user_id}, type={event.event_type}, "
+            f"sessions={len(targets)}, sent_to={total_sent}"
+        )
 
         return total_sent
 
@@ -218,14 +252,17 @@ class StreamManager:
             session_id=session_id,
         )
 
+        data = close_event.to_ndjson_bytes()
         for conn in connections:
-            await conn.send_event(close_event)
+            await conn.send_event(data)
             await conn.queue.put(None)  # Signal to close
 
-        # Remove connections
+        # Remove connections and buffered events
         async with self._lock:
             if session_id in self.connections:
                 del self.connections[session_id]
+            self._local_buffer.pop(session_id, None)
+            self._local_buffer_expiry.pop(session_id, None)
 
         logger.info(f"Session closed: session={session_id}")
 
@@ -250,11 +287,41 @@ class StreamManager:
             "connections_per_session": connections_per_session,
         }
 
-    async def _buffer_event(self, session_id: UUID, event: StreamEvent) -> None:
-        """Buffer event in Redis for reconnection recovery."""
+    def _serialize_for_broadcast(self, event: StreamEvent) -> bytes:
+        """Serialize event to an NDJSON line, truncating oversized payloads."""
+        data = event.to_ndjson_bytes()
+
+        # Validate event size
+        if len(data) > self.MAX_EVENT_SIZE:
+            logger.warning(
+                f"Event size {len(data)} exceeds max size {self.MAX_EVENT_SIZE}, "
+                "truncating payload"
+            )
+            event.payload = {"error": "Payload too large, fetch via API"}
+            data = event.to_ndjson_bytes()
+
+        return data
+
+    async def _buffer_event(
+        self, session_id: UUID, event: StreamEvent, data: bytes | None = None
+    ) -> None:
+        """Buffer event in Redis for reconnection recovery.
+
+        Args:
+            session_id: Session UUID
+            event: Event to buffer
+            data: Already serialized event, reused instead of encoding again
+        """
         try:
+            event_json = data if data is not None else event.to_ndjson_bytes()
+
+            if not self.use_redis_buffer:
+                # Bounded deque evicts the oldest event on its own
+                self._local_buffer[session_id].appendleft(event_json)
+                self._local_buffer_expiry[session_id] = time.monotonic() + self.BUFFER_TTL
+                return
+
             buffer_key = f"stream:buffer:{session_id}"
-            event_json = event.model_dump_json()
 
             # Add to list (left push for FIFO)
             await self.redis.lpush(buffer_key, event_json)
@@ -273,10 +340,13 @@ class StreamManager:
     ) -> None:
         """Send buffered events to a newly connected client."""
         try:
-            buffer_key = f"stream:buffer:{session_id}"
-
             # Get all buffered events (in reverse order for FIFO)
-            buffered = await self.redis.lrange(buffer_key, 0, -1)
+            if self.use_redis_buffer:
+                buffer_key = f"stream:buffer:{session_id}"
+                buffered = await self.redis.lrange(buffer_key, 0, -1)
+            else:
+                self._prune_local_buffers()
+                buffered = list(self._local_buffer.get(session_id, ()))
 
             if buffered:
                 events_to_send = []
@@ -313,6 +383,18 @@ class StreamManager:
         except Exception as e:
             logger.error(f"Failed to retrieve buffered events: {e}")
 
+    def _prune_local_buffers(self) -> None:
+        """Drop in-process buffers whose TTL has expired."""
+        now = time.monotonic()
+        expired = [
+            session_id
+            for session_id, deadline in self._local_buffer_expiry.items()
+            if deadline <= now
+        ]
+        for session_id in expired:
+            self._local_buffer.pop(session_id, None)
+            del self._local_buffer_expiry[session_id]
+
     async def _heartbeat_loop(self) -> None:
         """Background task to send heartbeats to all connections."""
         while True:
@@ -335,6 +417,9 @@ class StreamManager:
 
                 logger.debug(f"Heartbeat sent to {len(all_connections)} connections")
 
+                if not self.use_redis_buffer:
+                    self._prune_local_buffers()
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -349,7 +434,9 @@ async def get_stream_manager(redis: Redis) -> StreamManager:
     """Get or create Stream manager instance."""
     global _stream_manager
     if _stream_manager is None:
-        _stream_manager = StreamManager(redis)
+        _stream_manager = StreamManager(
+            redis, use_redis_buffer=settings.sse_use_redis_buffer
+        )
         await _stream_manager.start()
     return _stream_manager
 
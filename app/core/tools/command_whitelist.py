@@ -1,19 +1,57 @@
 """Command Validator with Whitelist/Blacklist for safe command execution"""
 
-import shlex
+import functools
 import re
-from typing import Tuple, Set
+from collections.abc import Iterable
+from typing import Tuple
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Trailing version suffix: digits, dots, and hyphens (python3.11, gcc-12)
+_VERSION_RE = re.compile(r'[\d\.\-]+$')
+
+# POSIX shell-style lexer (same quoting rules as shlex.split):
+# unquoted runs, backslash escapes, "double" and 'single' quoted runs.
+# Adjacent pieces join into one argument; whitespace separates arguments.
+_TOKEN_RE = re.compile(
+    r"(?P<space>[ \t\r\n]+)"
+    r"""|(?P<bare>[^ \t\r\n'"\\]+)"""
+    r"|\\(?P<escaped>.)"
+    r'|"(?P<double>(?:[^"\\]|\\.)*)"'
+    r"|'(?P<single>[^']*)'"
+    r"|(?P<error>.)",
+    re.DOTALL,
+)
+# Inside double quotes only \" and \\ are escapes
+_DOUBLE_QUOTE_ESCAPE_RE = re.compile(r'\\([\\"])')
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_command(command: str) -> str:
+    """Reduce a command to its lowercase base name without path or version
+    
+    Cached: tool calls draw from a small command vocabulary, so repeated
+    commands skip the strip/lower/regex pipeline.
+    
+    Examples:
+        "  /usr/bin/Python3.11 " → python
+        
+    Args:
+        command: Raw command string
+        
+    Returns:
+        Normalized base command name
+    """
+    return _VERSION_RE.sub('', command.strip().lower().rpartition("/")[2])
+
 
 class CommandValidator:
     """Validates commands against whitelist/blacklist to prevent malicious execution"""
     
     # WHITELIST: Safe commands allowed for execution
     # Only commands explicitly in this list can be executed
-    ALLOWED_COMMANDS = {
+    ALLOWED_COMMANDS = frozenset({
         # Search utilities
         "grep", "find", "locate",
         # File utilities
@@ -34,11 +72,11 @@ class CommandValidator:
         "sed", "awk", "sort", "uniq", "cut",
         # Others
         "diff", "patch", "test",
-    }
+    })
     
     # BLACKLIST: Dangerous commands that are explicitly denied
     # These are never allowed, even if in whitelist
-    FORBIDDEN_COMMANDS = {
+    FORBIDDEN_COMMANDS = frozenset({
         # Destructive operations
         "rm", "rmdir", "dd", "mkfs", "fsck", "fdisk", "parted",
         # Privilege escalation
@@ -55,7 +93,22 @@ class CommandValidator:
         "nmap", "netstat", "iptables", "ifconfig", "ip",
         # Dangerous shells
         "bash", "sh", "zsh", "ksh",  # Direct shell invocation
-    }
+    })
+    
+    # Subcommands allowed per package/VCS tool
+    GIT_SUBCOMMANDS = frozenset({
+        "clone", "pull", "fetch", "push", "commit", "add",
+        "status", "log", "branch", "checkout", "merge",
+        "init", "config", "stash", "tag", "show"
+    })
+    NPM_SUBCOMMANDS = frozenset({
+        "install", "i", "run", "start", "test", "build",
+        "list", "info", "search", "view", "outdated"
+    })
+    PIP_SUBCOMMANDS = frozenset({
+        "install", "list", "show", "search", "freeze",
+        "check", "index"
+    })
     
     def __init__(self):
         """Initialize command validator"""
@@ -70,17 +123,9 @@ class CommandValidator:
         Returns:
             Tuple of (is_allowed, normalized_command_or_error)
         """
-        # Normalize command (lowercase, strip whitespace)
-        cmd = command.strip().lower()
-        
-        # Handle path-based commands (e.g., /usr/bin/python)
-        if "/" in cmd:
-            base_cmd = cmd.split("/")[-1]  # Get last part after last /
-        else:
-            base_cmd = cmd
-        
-        # Remove version numbers (python3 → python, node18 → node)
-        base_cmd = self._strip_version(base_cmd)
+        # Normalize command (strip, lowercase, drop path and version:
+        # /usr/bin/python3 → python, node18 → node)
+        base_cmd = normalize_command(command)
         
         # Check blacklist first (explicit deny - highest priority)
         if base_cmd in self.FORBIDDEN_COMMANDS:
@@ -97,6 +142,18 @@ class CommandValidator:
         self.logger.debug(f"Command validation passed: {command}")
         return True, base_cmd
     
+    def validate_commands(self, commands: Iterable[str]) -> list[tuple[bool, str]]:
+        """Validate several commands in one call
+        
+        Args:
+            commands: Command strings to validate
+            
+        Returns:
+            List of (is_allowed, normalized_command_or_error), one per command
+        """
+        validate = self.validate_command
+        return [validate(command) for command in commands]
+    
     def validate_command_safety(
         self,
         command: str,
@@ -113,12 +170,10 @@ class CommandValidator:
         Returns:
             Tuple of (is_safe, message)
         """
-        is_allowed, msg = self.validate_command(command)
+        # On success validate_command returns the normalized command
+        is_allowed, base_cmd = self.validate_command(command)
         if not is_allowed:
-            return False, msg
-        
-        # Get normalized command
-        base_cmd = self._strip_version(command.strip().lower().split("/")[-1])
+            return False, base_cmd
         
         # Special handling for specific commands
         
@@ -130,14 +185,9 @@ class CommandValidator:
         
         # git: whitelist specific subcommands
         if base_cmd == "git":
-            allowed_subcommands = {
-                "clone", "pull", "fetch", "push", "commit", "add",
-                "status", "log", "branch", "checkout", "merge",
-                "init", "config", "stash", "tag", "show"
-            }
             if args:
                 subcommand = args[0].lower()
-                if subcommand not in allowed_subcommands:
+                if subcommand not in self.GIT_SUBCOMMANDS:
                     error = f"git subcommand '{subcommand}' not allowed"
                     self.logger.warning(error)
                     return False, error
@@ -146,13 +196,9 @@ class CommandValidator:
         
         # npm: whitelist specific subcommands
         if base_cmd == "npm":
-            allowed_subcommands = {
-                "install", "i", "run", "start", "test", "build",
-                "list", "info", "search", "view", "outdated"
-            }
             if args:
                 subcommand = args[0].lower()
-                if subcommand not in allowed_subcommands:
+                if subcommand not in self.NPM_SUBCOMMANDS:
                     error = f"npm subcommand '{subcommand}' not allowed"
                     self.logger.warning(error)
                     return False, error
@@ -162,13 +208,9 @@ class CommandValidator:
         
         # pip: whitelist specific subcommands
         if base_cmd == "pip":
-            allowed_subcommands = {
-                "install", "list", "show", "search", "freeze",
-                "check", "index"
-            }
             if args:
                 subcommand = args[0].lower()
-                if subcommand not in allowed_subcommands:
+                if subcommand not in self.PIP_SUBCOMMANDS:
                     error = f"pip subcommand '{subcommand}' not allowed"
                     self.logger.warning(error)
                     return False, error
@@ -197,13 +239,14 @@ class CommandValidator:
             Command name without version
         """
         # Remove trailing digits, dots, and hyphens
-        return re.sub(r'[\d\.\-]+$', '', cmd)
+        return _VERSION_RE.sub('', cmd)
     
     @staticmethod
     def parse_command_safely(command: str) -> Tuple[str, list]:
         """Parse command string into command + args safely
         
-        Uses shlex to properly handle quoted arguments
+        Splits with shell-style quoting (same rules as shlex.split) using a
+        single precompiled regex pass
         
         Args:
             command: Command string to parse
@@ -215,7 +258,27 @@ class CommandValidator:
             ValueError: If command syntax is invalid
         """
         try:
-            parts = shlex.split(command)
+            parts = []
+            current = None
+            for match in _TOKEN_RE.finditer(command):
+                kind = match.lastgroup
+                # Every alternative of _TOKEN_RE is a named group
+                assert kind is not None
+                if kind == "space":
+                    if current is not None:
+                        parts.append(current)
+                        current = None
+                    continue
+                if kind == "error":
+                    if match.group() == "\\":
+                        raise ValueError("No escaped character")
+                    raise ValueError("No closing quotation")
+                value = match.group(kind)
+                if kind == "double":
+                    value = _DOUBLE_QUOTE_ESCAPE_RE.sub(r"\1", value)
+                current = value if current is None else current + value
+            if current is not None:
+                parts.append(current)
             if not parts:
                 raise ValueError("Empty command")
             return parts[0], parts[1:]
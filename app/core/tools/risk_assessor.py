@@ -1,8 +1,9 @@
 """Risk Assessment for Tool Execution"""
 
+import os
 from enum import Enum
-from typing import Tuple
-from app.core.tools.command_whitelist import CommandValidator
+from typing import Any, Tuple
+from app.core.tools.command_whitelist import normalize_command
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -38,28 +39,28 @@ class RiskAssessor:
     # ========================================================================
     
     # Safe file extensions (text/code files)
-    WRITE_FILE_LOW_RISK_EXTENSIONS = {
+    WRITE_FILE_LOW_RISK_EXTENSIONS = frozenset({
         ".txt", ".md", ".json", ".yaml", ".yml", ".toml",
         ".py", ".js", ".ts", ".jsx", ".tsx", ".vue",
         ".css", ".html", ".xml", ".sql", ".sh",
         ".c", ".cpp", ".h", ".hpp", ".cc", ".cxx",
         ".java", ".go", ".rs", ".rb", ".php",
         ".log", ".csv", ".tsv", ".xml", ".ini",
-    }
+    })
     
     # Dangerous file extensions (executables/system files)
-    WRITE_FILE_HIGH_RISK_EXTENSIONS = {
+    WRITE_FILE_HIGH_RISK_EXTENSIONS = frozenset({
         ".exe", ".bin", ".so", ".dll", ".dylib",
         ".sys", ".drv", ".conf", ".config",
         ".app", ".deb", ".rpm", ".msi",
-    }
+    })
     
     # ========================================================================
     # COMMAND RISK BY COMMAND NAME
     # ========================================================================
     
     # Safe read-only commands (LOW RISK)
-    COMMAND_LOW_RISK = {
+    COMMAND_LOW_RISK = frozenset({
         # Search utilities
         "grep", "find", "locate",
         # File utilities
@@ -70,29 +71,56 @@ class RiskAssessor:
         "sed", "awk", "sort", "uniq", "cut",
         # Comparison
         "diff", "patch", "test",
-    }
+    })
     
     # Moderate risk commands (MEDIUM RISK)
-    COMMAND_MEDIUM_RISK = {
+    COMMAND_MEDIUM_RISK = frozenset({
         # Version control
         "git",
         # Package managers
         "npm", "pip", "yarn", "pnpm",
         # Interpreters (can execute arbitrary code)
         "node", "python", "python3", "ruby", "php",
-    }
+    })
     
     # High risk commands (HIGH RISK)
-    COMMAND_HIGH_RISK = {
+    COMMAND_HIGH_RISK = frozenset({
         # Compilers (can create executables)
         "gcc", "g++", "cc", "make", "clang",
         # Archiving (can extract arbitrary files)
         "zip", "unzip", "tar", "gzip", "gunzip",
+    })
+    
+    # Single base command → risk table built from the sets above
+    COMMAND_RISKS = {
+        **dict.fromkeys(COMMAND_HIGH_RISK, RiskLevel.HIGH),
+        **dict.fromkeys(COMMAND_MEDIUM_RISK, RiskLevel.MEDIUM),
+        **dict.fromkeys(COMMAND_LOW_RISK, RiskLevel.LOW),
+    }
+    
+    # Approval timeouts in seconds per risk level
+    TIMEOUTS = {
+        RiskLevel.LOW: 0,          # No approval needed
+        RiskLevel.MEDIUM: 300,     # 5 minutes
+        RiskLevel.HIGH: 600,       # 10 minutes
+    }
+    
+    RISK_DESCRIPTIONS = {
+        RiskLevel.LOW: "No approval needed - safe operation",
+        RiskLevel.MEDIUM: "Requires approval - moderate risk (5 min timeout)",
+        RiskLevel.HIGH: "Requires approval - high risk (10 min timeout)",
     }
     
     def __init__(self):
         """Initialize risk assessor"""
         self.logger = logger
+        # tool name → handler(params) returning the RiskLevel
+        self._dispatch = {
+            "read_file": self._assess_read_file_risk,
+            "list_directory": self._assess_list_directory_risk,
+            "write_file": self._assess_write_file_risk,
+            "execute_command": self._assess_command_risk,
+        }
     
     def assess_tool_risk(self, tool_name: str, params: dict) -> RiskLevel:
         """Assess overall risk level of tool execution
@@ -104,24 +132,22 @@ class RiskAssessor:
         Returns:
             RiskLevel (LOW, MEDIUM, HIGH)
         """
-        if tool_name == "read_file":
-            return self.READ_FILE_RISK
-        
-        elif tool_name == "list_directory":
-            return self.LIST_DIRECTORY_RISK
-        
-        elif tool_name == "write_file":
-            return self._assess_write_file_risk(params)
-        
-        elif tool_name == "execute_command":
-            return self._assess_command_risk(params)
-        
-        else:
+        handler = self._dispatch.get(tool_name)
+        if handler is None:
             # Unknown tools are HIGH risk by default
             self.logger.warning(f"Unknown tool '{tool_name}' - assuming HIGH risk")
             return RiskLevel.HIGH
+        return handler(params)
+    
+    def _assess_read_file_risk(self, _params: dict[str, Any]) -> RiskLevel:
+        """Assess risk of read_file operation (always READ_FILE_RISK)"""
+        return self.READ_FILE_RISK
     
-    def _assess_write_file_risk(self, params: dict) -> RiskLevel:
+    def _assess_list_directory_risk(self, _params: dict[str, Any]) -> RiskLevel:
+        """Assess risk of list_directory operation (always LIST_DIRECTORY_RISK)"""
+        return self.LIST_DIRECTORY_RISK
+    
+    def _assess_write_file_risk(self, params: dict[str, Any]) -> RiskLevel:
         """Assess risk of write_file operation based on file extension
         
         Args:
@@ -133,7 +159,6 @@ class RiskAssessor:
         path = params.get("path", "")
         
         # Extract file extension
-        import os
         _, ext = os.path.splitext(path)
         ext = ext.lower()
         
@@ -154,7 +179,7 @@ class RiskAssessor:
             self.logger.info(f"write_file risk: MEDIUM (unknown extension: {ext})")
             return RiskLevel.MEDIUM
     
-    def _assess_command_risk(self, params: dict) -> RiskLevel:
+    def _assess_command_risk(self, params: dict[str, Any]) -> RiskLevel:
         """Assess risk of execute_command based on command name
         
         Args:
@@ -163,38 +188,29 @@ class RiskAssessor:
         Returns:
             RiskLevel
         """
-        command = params.get("command", "").lower().strip()
-        
-        # Parse command to get base name
-        if "/" in command:
-            # Handle path-based commands (e.g., /usr/bin/python)
-            base_cmd = command.split("/")[-1]
-        else:
-            # Get first word (before any spaces)
-            base_cmd = command.split()[0] if command else ""
-        
-        # Remove version numbers
-        base_cmd = CommandValidator._strip_version(base_cmd)
+        command = params.get("command", "")
+
+        # Path-based commands (e.g. /usr/bin/python) keep everything after
+        # the last "/", so a "/" anywhere in the arguments also yields an
+        # unknown (HIGH risk) command; otherwise take the first word
+        if "/" not in command:
+            words = command.split(None, 1)
+            command = words[0] if words else ""
+
+        # Lowercase and drop path prefix and version, like the whitelist
+        base_cmd = normalize_command(command)
         
         self.logger.debug(f"Assessing command risk for: {base_cmd}")
         
         # Assess risk
-        if base_cmd in self.COMMAND_LOW_RISK:
-            self.logger.info(f"command risk: LOW (command: {base_cmd})")
-            return RiskLevel.LOW
-        
-        elif base_cmd in self.COMMAND_MEDIUM_RISK:
-            self.logger.info(f"command risk: MEDIUM (command: {base_cmd})")
-            return RiskLevel.MEDIUM
-        
-        elif base_cmd in self.COMMAND_HIGH_RISK:
-            self.logger.info(f"command risk: HIGH (command: {base_cmd})")
-            return RiskLevel.HIGH
-        
-        else:
+        risk = self.COMMAND_RISKS.get(base_cmd)
+        if risk is None:
             # Unknown commands are HIGH risk by default
             self.logger.warning(f"command risk: HIGH (unknown command: {base_cmd})")
             return RiskLevel.HIGH
+        
+        self.logger.info(f"command risk: {risk.value} (command: {base_cmd})")
+        return risk
     
     def get_timeout_for_risk_level(self, risk_level: RiskLevel) -> int:
         """Get approval timeout in seconds for risk level
@@ -205,12 +221,7 @@ class RiskAssessor:
         Returns:
             Timeout in seconds
         """
-        timeouts = {
-            RiskLevel.LOW: 0,          # No approval needed
-            RiskLevel.MEDIUM: 300,     # 5 minutes
-            RiskLevel.HIGH: 600,       # 10 minutes
-        }
-        return timeouts.get(risk_level, 300)
+        return self.TIMEOUTS.get(risk_level, 300)
     
     def requires_approval(self, risk_level: RiskLevel) -> bool:
         """Check if tool requires user approval based on risk level
@@ -221,7 +232,7 @@ class RiskAssessor:
         Returns:
             True if approval is required
         """
-        return risk_level != RiskLevel.LOW
+        return risk_level is not RiskLevel.LOW
     
     def get_risk_description(self, risk_level: RiskLevel) -> str:
         """Get human-readable description of risk level
@@ -232,12 +243,7 @@ class RiskAssessor:
         Returns:
             Description string
         """
-        descriptions = {
-            RiskLevel.LOW: "No approval needed - safe operation",
-            RiskLevel.MEDIUM: "Requires approval - moderate risk (5 min timeout)",
-            RiskLevel.HIGH: "Requires approval - high risk (10 min timeout)",
-        }
-        return descriptions.get(risk_level, "Unknown risk level")
+        return self.RISK_DESCRIPTIONS.get(risk_level, "Unknown risk level")
     
     def get_full_risk_assessment(
         self,
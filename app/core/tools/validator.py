@@ -1,6 +1,7 @@
 """Path Validator for safe file operations"""
 
 import os
+import stat
 from pathlib import Path
 from typing import Tuple
 from app.logging_config import get_logger
@@ -12,11 +13,11 @@ class PathValidator:
     """Validates file paths for safety and prevents path traversal attacks"""
     
     # Dangerous file extensions that should not be written
-    FORBIDDEN_EXTENSIONS = {
+    FORBIDDEN_EXTENSIONS = frozenset({
         ".exe", ".bin", ".so", ".dll", ".dylib",
         ".sh", ".bat", ".cmd", ".scr", ".msi",
         ".app", ".deb", ".rpm"
-    }
+    })
     
     # Maximum file size for read operations (100MB)
     MAX_FILE_SIZE = 100 * 1024 * 1024
@@ -27,7 +28,11 @@ class PathValidator:
         Args:
             workspace_root: Absolute path to workspace root
         """
-        self.workspace_root = Path(workspace_root).resolve()
+        # Canonicalize the root once; containment checks compare strings
+        # against it instead of re-resolving the root on every call
+        self._canonical_root = os.path.realpath(workspace_root)
+        self._canonical_root_prefix = os.path.join(self._canonical_root, "")
+        self.workspace_root = Path(self._canonical_root)
         logger.info(f"PathValidator initialized with workspace: {self.workspace_root}")
     
     def validate_read_path(self, path: str) -> Tuple[bool, str]:
@@ -48,27 +53,29 @@ class PathValidator:
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
-            # Check if file exists
-            if not file_path.exists():
+            # Check if file exists (one stat serves all checks below)
+            try:
+                st = os.stat(file_path)
+            except OSError:
                 error = f"File not found: {path}"
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
             # Check if it's a file (not directory)
-            if not file_path.is_file():
+            if not stat.S_ISREG(st.st_mode):
                 error = f"Path is not a file: {path}"
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
             # Check file size
-            file_size = file_path.stat().st_size
+            file_size = st.st_size
             if file_size > self.MAX_FILE_SIZE:
                 error = f"File too large: {file_size} bytes (max {self.MAX_FILE_SIZE})"
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
             logger.debug(f"Path validation passed for read: {path}")
-            return True, str(file_path)
+            return True, file_path
         
         except Exception as e:
             error = f"Error validating read path {path}: {str(e)}"
@@ -85,6 +92,11 @@ class PathValidator:
             Tuple of (is_valid, error_message)
         """
         try:
+            # Reject forbidden extensions up front - pure string work, no syscalls
+            error = self._check_write_extension(path)
+            if error:
+                return False, error
+            
             file_path = self._resolve_path(path)
             
             # Check if path is within workspace boundary
@@ -93,18 +105,16 @@ class PathValidator:
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
-            # Check file extension (prevent writing executables)
-            ext = file_path.suffix.lower()
-            if ext in self.FORBIDDEN_EXTENSIONS:
-                error = f"Writing to {ext} files is not allowed"
-                logger.warning(f"Path validation failed: {error}")
+            # Check the resolved extension too (a symlink may point to an executable)
+            error = self._check_write_extension(file_path)
+            if error:
                 return False, error
             
             # Check if parent directory exists or can be created
-            parent = file_path.parent
-            if not parent.exists():
+            parent = os.path.dirname(file_path)
+            if not os.path.exists(parent):
                 try:
-                    parent.mkdir(parents=True, exist_ok=True)
+                    os.makedirs(parent, exist_ok=True)
                     logger.debug(f"Created parent directory: {parent}")
                 except PermissionError:
                     error = f"Permission denied creating parent directory: {parent}"
@@ -112,7 +122,7 @@ class PathValidator:
                     return False, error
             
             logger.debug(f"Path validation passed for write: {path}")
-            return True, str(file_path)
+            return True, file_path
         
         except Exception as e:
             error = f"Error validating write path {path}: {str(e)}"
@@ -137,59 +147,85 @@ class PathValidator:
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
-            # Check if directory exists
-            if not dir_path.exists():
+            # Check if directory exists (one stat serves both checks)
+            try:
+                st = os.stat(dir_path)
+            except OSError:
                 error = f"Directory not found: {path}"
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
             # Check if it's a directory
-            if not dir_path.is_dir():
+            if not stat.S_ISDIR(st.st_mode):
                 error = f"Path is not a directory: {path}"
                 logger.warning(f"Path validation failed: {error}")
                 return False, error
             
             logger.debug(f"Path validation passed for directory: {path}")
-            return True, str(dir_path)
+            return True, dir_path
         
         except Exception as e:
             error = f"Error validating directory path {path}: {str(e)}"
             logger.error(error)
             return False, error
     
-    def _resolve_path(self, path: str) -> Path:
+    def _check_write_extension(self, path: str) -> str:
+        """Check file extension against FORBIDDEN_EXTENSIONS
+        
+        Args:
+            path: Path to check
+            
+        Returns:
+            Error message, or empty string if the extension is allowed
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext in self.FORBIDDEN_EXTENSIONS:
+            error = f"Writing to {ext} files is not allowed"
+            logger.warning(f"Path validation failed: {error}")
+            return error
+        return ""
+    
+    def _resolve_path(self, path: str) -> str:
         """Resolve path safely relative to workspace root
         
+        Works on plain strings with os.path to avoid building PurePath
+        objects on every validation.
+        
         Args:
             path: Potentially unsafe path string
             
         Returns:
-            Resolved absolute Path object
+            Resolved absolute path
         """
         # Treat path as relative to workspace root
-        abs_path = self.workspace_root / path
-        return abs_path.resolve()
+        joined = os.path.join(self._canonical_root, path)
+        
+        # '..' has to be resolved symlink-aware, so take the full realpath
+        if os.pardir in joined.split(os.sep):
+            return os.path.realpath(joined)
+        
+        # Otherwise canonicalize only the parent and lstat the final
+        # component: a non-symlink leaf needs no further resolution
+        parent, name = os.path.split(os.path.normpath(joined))
+        candidate = os.path.join(os.path.realpath(parent), name)
+        if os.path.islink(candidate):
+            return os.path.realpath(candidate)
+        return candidate
     
-    def _is_within_workspace(self, path: Path) -> bool:
+    def _is_within_workspace(self, path: str) -> bool:
         """Check if path is within workspace boundary
         
         Prevents path traversal attacks (../, symlinks, etc.)
         
         Args:
-            path: Path to check
+            path: Resolved path to check (output of _resolve_path)
             
         Returns:
             True if path is within workspace, False otherwise
         """
-        try:
-            # Resolve both paths to absolute
-            resolved = path.resolve()
-            workspace = self.workspace_root.resolve()
-            
-            # Check if resolved path starts with workspace path
-            # This prevents directory traversal
-            resolved.relative_to(workspace)
-            return True
-        except ValueError:
-            # relative_to raises ValueError if path is not relative
-            return False
+        # path is already canonical (symlinks and .. resolved), so a plain
+        # prefix compare against the cached canonical root is sufficient
+        return (
+            path == self._canonical_root
+            or path.startswith(self._canonical_root_prefix)
+        )
@@ -2,6 +2,7 @@
 
 import asyncio
 import time
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
@@ -23,32 +24,52 @@ logger = get_logger(__name__)
 
 
 class AgentCache:
-    """Cache for agent instances and configurations."""
+    """Cache for agent instances and configurations.
 
-    def __init__(self, redis: Optional[Redis] = None, ttl_seconds: int = 300):
+    Entries expire locally ttl_seconds after ``set``, independently of the
+    worker space's ``active_agents``, which stays the source of truth for
+    live agents. Once the TTL has elapsed an agent is reported as not
+    cached (``is_in_cache`` False) while ``get_agent`` still returns it.
+    """
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        ttl_seconds: int = 300,
+        time_source: Callable[[], float] = time.monotonic,
+    ):
         """Initialize agent cache.
 
         Args:
             redis: Redis client for distributed caching
             ttl_seconds: Cache TTL in seconds
+            time_source: Monotonic clock used for local expiry
         """
         self.redis = redis
         self.ttl_seconds = ttl_seconds
-        self.local_cache: dict[UUID, ContextualAgent] = {}
-        self.cache_metadata: dict[UUID, datetime] = {}
+        self.time_source = time_source
+        # agent_id -> (agent, monotonic expiry time)
+        self.local_cache: dict[UUID, tuple[ContextualAgent, float]] = {}
 
-    async def get(self, agent_id: UUID) -> Optional[ContextualAgent]:
+    def get(self, agent_id: UUID) -> Optional[ContextualAgent]:
         """Get agent from cache.
 
+        Synchronous: a hit is a single dict lookup, no coroutine needed.
+        Expired entries are evicted lazily on lookup.
+
         Args:
             agent_id: Agent ID
 
         Returns:
             Agent instance or None
         """
-        if agent_id in self.local_cache:
-            return self.local_cache[agent_id]
-        return None
+        entry = self.local_cache.get(agent_id)
+        if entry is None:
+            return None
+        if entry[1] <= self.time_source():
+            del self.local_cache[agent_id]
+            return None
+        return entry[0]
 
     async def set(self, agent_id: UUID, agent: ContextualAgent) -> None:
         """Store agent in cache.
@@ -57,8 +78,7 @@ class AgentCache:
             agent_id: Agent ID
             agent: Agent instance
         """
-        self.local_cache[agent_id] = agent
-        self.cache_metadata[agent_id] = datetime.utcnow()
+        self.local_cache[agent_id] = (agent, self.time_source() + self.ttl_seconds)
 
         if self.redis:
             try:
@@ -81,11 +101,7 @@ class AgentCache:
         Args:
             agent_id: Agent ID
         """
-        if agent_id in self.local_cache:
-            del self.local_cache[agent_id]
-
-        if agent_id in self.cache_metadata:
-            del self.cache_metadata[agent_id]
+        self.local_cache.pop(agent_id, None)
 
         if self.redis:
             try:
@@ -98,22 +114,19 @@ class AgentCache:
                     error=str(e),
                 )
 
-    async def clear(self) -> None:
-        """Clear all cached agents."""
-        self.local_cache.clear()
-        self.cache_metadata.clear()
+    def clear(self) -> None:
+        """Clear all cached agents.
 
-        if self.redis:
-            try:
-                await self.redis.delete("agent:*")
-            except Exception as e:
-                logger.warning("redis_clear_error", error=str(e))
+        Only the local cache is cleared: Redis entries are written with
+        setex and expire on their own after ttl_seconds.
+        """
+        self.local_cache.clear()
 
     def get_size(self) -> int:
         """Get cache size.
 
         Returns:
-            Number of cached agents
+            Number of cached agents (expired entries not yet looked up included)
         """
         return len(self.local_cache)
 
@@ -285,7 +298,11 @@ class UserWorkerSpace:
             raise
 
     async def get_agent(self, agent_id: UUID) -> Optional[ContextualAgent]:
-        """Get agent from cache.
+        """Get agent from worker space.
+
+        Steady state is a plain dict lookup with no awaits; initialization
+        only runs on the first call (``initialize`` re-checks the flag under
+        ``self.lock``, so concurrent first calls initialize once).
 
         Args:
             agent_id: Agent ID
@@ -293,10 +310,12 @@ class UserWorkerSpace:
         Returns:
             Agent instance or None
         """
-        if not self.initialized:
-            await self.initialize()
+        agent = self.active_agents.get(agent_id)
+        if agent is not None or self.initialized:
+            return agent
 
-        return await self.agent_cache.get(agent_id)
+        await self.initialize()
+        return self.active_agents.get(agent_id)
 
     async def add_agent(self, agent_config: AgentConfig) -> UUID:
         """Add new agent to worker space.
@@ -460,7 +479,7 @@ class UserWorkerSpace:
         if not self.initialized:
             await self.initialize()
 
-        agent = await self.agent_cache.get(agent_id)
+        agent = self.active_agents.get(agent_id)
         if not agent:
             logger.warning(
                 "agent_not_found_for_context_store",
@@ -963,7 +982,8 @@ class UserWorkerSpace:
                 "agent_id": str,
                 "agent_name": str,
                 "is_active": bool,
-                "is_in_cache": bool,
+                "is_in_cache": bool (False once the cache TTL elapsed,
+                    even while the agent is active),
 
                 "execution": {
                     "total_executions": int,
@@ -1011,7 +1031,7 @@ class UserWorkerSpace:
             "agent_id": str(agent_id),
             "agent_name": agent.agent_name,
             "is_active": agent_id in self.active_agents,
-            "is_in_cache": await self.agent_cache.get(agent_id) is not None,
+            "is_in_cache": self.agent_cache.get(agent_id) is not None,
             "execution": {
                 "total_executions": 0,
                 "successful": 0,
@@ -1185,7 +1205,7 @@ class UserWorkerSpace:
                         )
 
                 # Clear cache
-                await self.agent_cache.clear()
+                self.agent_cache.clear()
                 self.active_agents.clear()
 
                 self.initialized = False
@@ -36,23 +36,26 @@ class WorkerSpaceManager:
         if self._initialized:
             return
 
-        self.spaces: dict[str, UserWorkerSpace] = {}
+        self.spaces: dict[tuple[UUID, str], UserWorkerSpace] = {}
         self.agent_bus = AgentBus()
         self._initialized = True
 
         logger.info("worker_space_manager_initialized")
 
-    def _make_key(self, user_id: UUID, project_id: str) -> str:
+    def _make_key(self, user_id: UUID, project_id: str) -> tuple[UUID, str]:
         """Create space key from user_id and project_id.
 
+        A plain tuple hashes the UUID's int directly instead of formatting
+        both parts into a string on every lookup.
+
         Args:
             user_id: User ID
             project_id: Project ID
 
         Returns:
-            Key string: f"{user_id}_{project_id}"
+            Key tuple: (user_id, project_id)
         """
-        return f"{user_id}_{project_id}"
+        return (user_id, project_id)
 
     async def get_or_create(
         self,
@@ -77,16 +80,16 @@ class WorkerSpaceManager:
         key = self._make_key(user_id, project_id)
 
         # Try fast path first
-        if key in self.spaces:
-            space = self.spaces[key]
+        space = self.spaces.get(key)
+        if space is not None:
             space.bind_request_dependencies(db=db, redis=redis, qdrant=qdrant)
             return space
 
         # Slow path with lock
         async with self._lock:
             # Double-check after acquiring lock
-            if key in self.spaces:
-                space = self.spaces[key]
+            space = self.spaces.get(key)
+            if space is not None:
                 space.bind_request_dependencies(db=db, redis=redis, qdrant=qdrant)
                 return space
 
@@ -194,8 +197,7 @@ class WorkerSpaceManager:
         Returns:
             Number of spaces removed
         """
-        prefix = f"{user_id}_"
-        keys_to_remove = [k for k in self.spaces.keys() if k.startswith(prefix)]
+        keys_to_remove = [k for k in self.spaces if k[0] == user_id]
 
         removed_count = 0
         for key in keys_to_remove:
@@ -205,7 +207,12 @@ class WorkerSpaceManager:
                 del self.spaces[key]
                 removed_count += 1
             except Exception as e:
-                logger.error("space_cleanup_error", key=key, error=str(e))
+                logger.error(
+                    "space_cleanup_error",
+                    user_id=str(user_id),
+                    project_id=key[1],
+                    error=str(e),
+                )
 
         logger.info(
             "user_spaces_removed",
@@ -224,9 +231,8 @@ class WorkerSpaceManager:
         Returns:
             List of worker spaces
         """
-        prefix = f"{user_id}_"
         return [
-            space for key, space in self.spaces.items() if key.startswith(prefix)
+            space for key, space in self.spaces.items() if key[0] == user_id
         ]
 
     async def cleanup_all(self) -> None:
@@ -235,13 +241,17 @@ class WorkerSpaceManager:
         Called during shutdown.
         """
         async with self._lock:
-            for space in self.spaces.values():
-                try:
-                    await space.cleanup()
-                except Exception as e:
-                    logger.error("space_cleanup_error", error=str(e))
-
+            spaces = list(self.spaces.values())
             self.spaces.clear()
+
+            # Spaces are independent, so clean them up concurrently
+            results = await asyncio.gather(
+                *(space.cleanup() for space in spaces), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error("space_cleanup_error", error=str(result))
+
             await self.agent_bus.cleanup()
 
             logger.info("all_worker_spaces_cleanup")
@@ -258,9 +268,9 @@ class WorkerSpaceManager:
             For detailed async stats, use individual workspace.get_metrics()
         """
         spaces_stats = {}
-        for key, space in self.spaces.items():
-            user_id_str, project_id = key.rsplit("_", 1)
-            spaces_stats[key] = {
+        for (user_id, project_id), space in self.spaces.items():
+            user_id_str = str(user_id)
+            spaces_stats[f"{user_id_str}_{project_id}"] = {
                 "user_id": user_id_str,
                 "project_id": project_id,
                 "initialized": space.initialized,
@@ -282,8 +292,7 @@ class WorkerSpaceManager:
         Returns:
             Number of projects
         """
-        prefix = f"{user_id}_"
-        return sum(1 for k in self.spaces.keys() if k.startswith(prefix))
+        return sum(1 for k in self.spaces if k[0] == user_id)
 
 
 # Global manager instance
@@ -49,9 +49,14 @@ async def event_stream_generator(
                     logger.info(f"Connection close signal received for session {session_id}")
                     break
 
+                # Broadcasts arrive pre-serialized as NDJSON lines
+                if isinstance(event, bytes):
+                    yield event
+                    continue
+
                 # Handle StreamEvent
                 if isinstance(event, StreamEvent):
-                    yield event.to_ndjson()
+                    yield event.to_ndjson_bytes()
                     continue
 
                 logger.warning(f"Unknown event type: {type(event)}")
@@ -72,7 +77,7 @@ async def event_stream_generator(
                     payload={"error": str(e)},
                     session_id=session_id,
                 )
-                yield error_event.to_ndjson()
+                yield error_event.to_ndjson_bytes()
                 break
 
     finally:
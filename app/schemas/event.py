@@ -30,6 +30,13 @@ class StreamEventType(str, Enum):
     ERROR = "error"
 
 
+# Precomputed "event: <type>\ndata: " frame prefixes, one per event type
+_SSE_PREFIXES: dict[str, bytes] = {
+    event_type: f"event: {event_type.value}\ndata: ".encode()
+    for event_type in StreamEventType
+}
+
+
 class StreamEvent(BaseModel):
     """Stream event schema for JSON Lines (NDJSON) format."""
 
@@ -54,28 +61,53 @@ class StreamEvent(BaseModel):
         }
     }}
 
+    def _json_bytes(self) -> bytes:
+        """Serialize event to JSON bytes with pydantic's native serializer."""
+        return self.__pydantic_serializer__.to_json(self)
+
     def to_ndjson(self) -> str:
         """
         Convert to NDJSON (Newline Delimited JSON) format.
-        
+
         Returns:
             JSON string with newline terminator
         """
-        return self.model_dump_json() + "\n"
+        return self.to_ndjson_bytes().decode()
+
+    def to_ndjson_bytes(self) -> bytes:
+        """
+        Convert to NDJSON (Newline Delimited JSON) format as raw bytes.
+
+        Avoids the str round-trip when writing straight to the wire.
+
+        Returns:
+            UTF-8 encoded JSON with newline terminator
+        """
+        return self._json_bytes() + b"\n"
 
     def to_sse_format(self) -> str:
         """
         Convert to SSE (Server-Sent Events) format.
-        
+
         Returns SSE format with event type and JSON data.
         Format: event: <event_type>\ndata: <json>\n\n
-        
+
         Returns:
             String in SSE format
         """
-        event_type = self.event_type.value if hasattr(self.event_type, 'value') else str(self.event_type)
-        json_data = self.model_dump_json()
-        return f"event: {event_type}\ndata: {json_data}\n\n"
+        return self.to_sse_bytes().decode()
+
+    def to_sse_bytes(self) -> bytes:
+        """
+        Convert to SSE (Server-Sent Events) format as raw bytes.
+
+        Returns:
+            UTF-8 encoded SSE frame
+        """
+        prefix = _SSE_PREFIXES.get(self.event_type)
+        if prefix is None:
+            prefix = f"event: {self.event_type}\ndata: ".encode()
+        return prefix + self._json_bytes() + b"\n\n"
 
 
 # Backward compatibility aliases
@@ -1,20 +1,19 @@
 """Test configuration and fixtures."""
 
-import asyncio
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID, uuid4
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from sqlalchemy import create_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.config import settings
+from app.core.worker_space_manager import get_worker_space_manager
 from app.database import Base, get_db
 from app.main import app
 from app.models.user import User
@@ -28,57 +27,91 @@ from app.qdrant_client import get_qdrant
 # Test database URL (in-memory SQLite)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-
-@pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
-@pytest_asyncio.fixture
+# Fixed identity of the test_user fixture (tokens can be signed without a DB row)
+TEST_USER_ID = UUID("123e4567-e89b-12d3-a456-426614174000")
+
+# Agent config templates for test_agents_fixture (copied per agent)
+TEST_AGENT_CONFIGS = (
+    {
+        "name": "test_coder",
+        "system_prompt": "You are a coder",
+        "model": "gpt-4",
+        "temperature": 0.3,
+        "max_tokens": 4096,
+    },
+    {
+        "name": "test_analyzer",
+        "system_prompt": "You are an analyzer",
+        "model": "gpt-4",
+        "temperature": 0.5,
+        "max_tokens": 2048,
+    },
+)
+
+
+@pytest_asyncio.fixture(scope="session")
 async def test_engine():
-    """Create test database engine."""
+    """Create test database engine and schema once per test session."""
     engine = create_async_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    
+
+    # pysqlite/aiosqlite defer BEGIN until the first DML statement, which
+    # turns a test's SAVEPOINT into the outermost transaction. Take over
+    # transaction control so the per-test rollback really undoes everything.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    
+
     yield engine
-    
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
-    
+
     await engine.dispose()
 
 
 @pytest_asyncio.fixture
 async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create test database session."""
-    async_session = sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    
-    async with async_session() as session:
-        yield session
-        await session.rollback()
+    """Create test database session rolled back after the test.
+
+    The session joins an outer transaction via SAVEPOINTs, so commits made
+    by fixtures and application code are undone when the outer transaction
+    is rolled back, without recreating the schema per test.
+    """
+    async with test_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
 
 
 @pytest_asyncio.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """Create test user."""
     user = User(
-        id=UUID("123e4567-e89b-12d3-a456-426614174000"),
+        id=TEST_USER_ID,
         email="test@example.com",
     )
     db_session.add(user)
+    # id is set here and created_at is a client-side default: no refresh needed
     await db_session.commit()
-    await db_session.refresh(user)
     return user
 
 
@@ -92,7 +125,6 @@ async def test_project(db_session: AsyncSession, test_user: User) -> UserProject
     )
     db_session.add(project)
     await db_session.commit()
-    await db_session.refresh(project)
     return project
 
 
@@ -113,71 +145,53 @@ async def test_agent(db_session: AsyncSession, test_user: User, test_project: Us
     )
     db_session.add(agent)
     await db_session.commit()
-    await db_session.refresh(agent)
     return agent
 
 
 @pytest_asyncio.fixture
 async def test_agents_fixture(db_session: AsyncSession, test_user: User, test_project: UserProject) -> list[UserAgent]:
     """Create test agents for worker space tests."""
-    agents = []
-    configs = [
-        {
-            "name": "test_coder",
-            "system_prompt": "You are a coder",
-            "model": "gpt-4",
-            "temperature": 0.3,
-            "max_tokens": 4096,
-        },
-        {
-            "name": "test_analyzer",
-            "system_prompt": "You are an analyzer",
-            "model": "gpt-4",
-            "temperature": 0.5,
-            "max_tokens": 2048,
-        },
-    ]
-
-    for config in configs:
-        agent = UserAgent(
+    agents = [
+        UserAgent(
             user_id=test_user.id,
             project_id=test_project.id,
             name=config["name"],
-            config=config,
+            config=dict(config),
             status="ready",
         )
-        db_session.add(agent)
-        agents.append(agent)
+        for config in TEST_AGENT_CONFIGS
+    ]
+    db_session.add_all(agents)
 
+    # All columns get client-side defaults and the session does not expire
+    # on commit, so the instances need no refresh round-trip afterwards
     await db_session.commit()
-    for agent in agents:
-        await db_session.refresh(agent)
 
     return agents
 
 
-@pytest.fixture
-def test_jwt_token(test_user: User) -> str:
-    """Generate test JWT token."""
+@pytest.fixture(scope="session")
+def test_jwt_token() -> str:
+    """Generate test JWT token for TEST_USER_ID once per test session."""
     from jose import jwt
     from datetime import datetime, timedelta, timezone
-    
+
     payload = {
-        "sub": str(test_user.id),
+        "sub": str(TEST_USER_ID),
         "exp": datetime.now(timezone.utc) + timedelta(hours=1),
         "iat": datetime.now(timezone.utc),
     }
-    
+
     token = jwt.encode(
         payload,
         settings.jwt_secret_key,
         algorithm=settings.jwt_algorithm
     )
-    
+
     return token
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def auth_headers(test_jwt_token: str) -> dict:
     """Create authorization headers."""
     return {
@@ -186,22 +200,40 @@ def auth_headers(test_jwt_token: str) -> dict:
     }
 
 
-@pytest_asyncio.fixture
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
-    """Create test client with database override."""
-    from httpx import ASGITransport
-    
-    async def override_get_db():
-        yield db_session
-    
-    app.dependency_overrides[get_db] = override_get_db
-    
+@pytest_asyncio.fixture(autouse=True)
+async def reset_worker_space_manager() -> AsyncGenerator[None, None]:
+    """Drop all worker spaces held by the process-wide manager after each test."""
+    yield
+    await get_worker_space_manager().cleanup_all()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def asgi_client() -> AsyncGenerator[AsyncClient, None]:
+    """Create one in-process ASGI client for the whole test session.
+
+    Per-test state lives in ``app.dependency_overrides``, which the
+    ``client`` fixtures install and clear around each test.
+    """
     async with AsyncClient(
         transport=ASGITransport(app=app),
         base_url="http://test"
     ) as ac:
         yield ac
-    
+
+
+@pytest_asyncio.fixture
+async def client(
+    asgi_client: AsyncClient, db_session: AsyncSession
+) -> AsyncGenerator[AsyncClient, None]:
+    """Create test client with database override."""
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    yield asgi_client
+
+    asgi_client.cookies.clear()
     app.dependency_overrides.clear()
 
 
@@ -211,14 +243,28 @@ def sync_client() -> TestClient:
     return TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def shared_redis_mock() -> AsyncMock:
+    """Create mock Redis client once per test session."""
+    return AsyncMock()
+
+
 @pytest.fixture
-def mock_redis() -> AsyncMock:
-    """Create mock Redis client."""
-    redis_mock = AsyncMock()
-    redis_mock.setex = AsyncMock(return_value=True)
-    redis_mock.get = AsyncMock(return_value=None)
-    redis_mock.delete = AsyncMock(return_value=1)
-    return redis_mock
+def mock_redis(shared_redis_mock: AsyncMock) -> AsyncMock:
+    """Reset shared mock Redis client for the current test.
+
+    Tests configure commands via ``return_value`` rather than replacing
+    attributes, so the reset restores a clean mock every time.
+    """
+    shared_redis_mock.reset_mock(return_value=True, side_effect=True)
+    shared_redis_mock.setex.return_value = True
+    shared_redis_mock.get.return_value = None
+    shared_redis_mock.delete.return_value = 1
+    shared_redis_mock.lpush.return_value = 1
+    shared_redis_mock.ltrim.return_value = True
+    shared_redis_mock.expire.return_value = True
+    shared_redis_mock.lrange.return_value = []
+    return shared_redis_mock
 
 
 @pytest.fixture
@@ -233,30 +279,26 @@ def mock_qdrant() -> AsyncMock:
 
 @pytest_asyncio.fixture
 async def client_with_mocks(
+    asgi_client: AsyncClient,
     db_session: AsyncSession,
     mock_redis: AsyncMock,
     mock_qdrant: AsyncMock,
 ) -> AsyncGenerator[AsyncClient, None]:
     """Create test client with database and service mocks."""
-    from httpx import ASGITransport
-    
     async def override_get_db():
         yield db_session
-    
+
     async def override_get_redis():
         return mock_redis
-    
+
     async def override_get_qdrant():
         return mock_qdrant
-    
+
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_redis] = override_get_redis
     app.dependency_overrides[get_qdrant] = override_get_qdrant
-    
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test"
-    ) as ac:
-        yield ac
-    
+
+    yield asgi_client
+
+    asgi_client.cookies.clear()
     app.dependency_overrides.clear()
@@ -7,8 +7,6 @@ Tests verify:
 4. Analytics aggregations accuracy
 """
 
-import pytest
-
 
 class TestAnalyticsAPIEndpoints:
     """Tests for analytics API endpoints (Group 5.6)."""
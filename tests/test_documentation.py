@@ -6,8 +6,6 @@ Tests verify:
 3. Migration notes and changelog
 """
 
-import pytest
-
 
 class TestDocumentation:
     """Tests for documentation requirements (Group 8)."""
@@ -7,8 +7,6 @@ Tests verify:
 4. Duplicate-safe retry semantics
 """
 
-import pytest
-
 
 class TestIdempotencyAndReliability:
     """Tests for idempotency guarantees (Group 6)."""
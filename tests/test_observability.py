@@ -6,8 +6,6 @@ Tests verify:
 3. Alert capability setup
 """
 
-import pytest
-
 
 class TestObservability:
     """Tests for observability requirements (Group 7)."""
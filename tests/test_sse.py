@@ -2,10 +2,12 @@
 
 import asyncio
 import json
-from datetime import datetime
+import random
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock
-from uuid import uuid4
+from uuid import UUID, uuid4
 
+import pydantic_core
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
@@ -17,17 +19,57 @@ from app.models.user import User
 from app.schemas.event import StreamEvent, StreamEventType
 
 
+# Template for tests that only vary the event type
+_BASE_EVENT = StreamEvent.model_construct(
+    event_type=StreamEventType.TASK_STARTED,
+    payload={"test": "data"},
+)
+
+# Payload string just over the broadcast size limit, built once at import
+_OVERSIZED_DATA = "x" * (StreamManager.MAX_EVENT_SIZE + 1000)
+
+
+@pytest.fixture(scope="module")
+def uuid_pool() -> list[UUID]:
+    """Build a pool of distinct UUIDs once per module."""
+    rng = random.Random()
+    return [UUID(int=rng.getrandbits(128), version=4) for _ in range(256)]
+
+
+@pytest.fixture
+def ids(uuid_pool: list[UUID]):
+    """Hand out distinct UUIDs from the shared pool."""
+    return iter(uuid_pool)
+
+
+@pytest_asyncio.fixture(scope="module")
+async def shared_stream_manager():
+    """Create one started SSE manager for the whole module."""
+    manager = StreamManager(AsyncMock())
+    await manager.start()
+    yield manager
+    await manager.stop()
+
+
 class TestStreamConnection:
     """Tests for StreamConnection class."""
 
+    @pytest.fixture
+    def make_connection(self, ids):
+        """Factory for connections with fresh ids and queue."""
+
+        def _make(maxsize: int = 1000):
+            # Same queue bound as StreamManager.register_connection
+            session_id, user_id = next(ids), next(ids)
+            queue = asyncio.Queue(maxsize=maxsize)
+            return StreamConnection(session_id, user_id, queue), session_id, user_id, queue
+
+        return _make
+
     @pytest.mark.asyncio
-    async def test_connection_creation(self):
+    async def test_connection_creation(self, make_connection):
         """Test SSE connection creation."""
-        session_id = uuid4()
-        user_id = uuid4()
-        queue = asyncio.Queue()
-
-        conn = StreamConnection(session_id, user_id, queue)
+        conn, session_id, user_id, queue = make_connection()
 
         assert conn.session_id == session_id
         assert conn.user_id == user_id
@@ -36,13 +78,9 @@ class TestStreamConnection:
         assert conn.last_heartbeat is not None
 
     @pytest.mark.asyncio
-    async def test_send_event(self):
+    async def test_send_event(self, make_connection):
         """Test sending event to connection."""
-        session_id = uuid4()
-        user_id = uuid4()
-        queue = asyncio.Queue()
-
-        conn = StreamConnection(session_id, user_id, queue)
+        conn, session_id, _, queue = make_connection()
 
         event = StreamEvent(
             event_type=StreamEventType.TASK_STARTED,
@@ -58,13 +96,9 @@ class TestStreamConnection:
         assert queued_event == event
 
     @pytest.mark.asyncio
-    async def test_send_heartbeat(self):
+    async def test_send_heartbeat(self, make_connection):
         """Test sending heartbeat."""
-        session_id = uuid4()
-        user_id = uuid4()
-        queue = asyncio.Queue()
-
-        conn = StreamConnection(session_id, user_id, queue)
+        conn, _, _, queue = make_connection()
         old_heartbeat = conn.last_heartbeat
 
         await asyncio.sleep(0.01)  # Small delay
@@ -78,18 +112,21 @@ class TestStreamConnection:
 
         # Check timestamp updated
         assert conn.last_heartbeat > old_heartbeat
+        assert conn.last_heartbeat_at > conn.connected_at
 
 
 class TestStreamManager:
     """Tests for StreamManager class."""
 
-    @pytest_asyncio.fixture
-    async def stream_manager(self, mock_redis):
-        """Create SSE manager instance."""
-        manager = StreamManager(mock_redis)
-        await manager.start()
-        yield manager
-        await manager.stop()
+    @pytest.fixture
+    def stream_manager(self, shared_stream_manager, mock_redis):
+        """Bind the shared SSE manager to this test's Redis mock."""
+        shared_stream_manager.redis = mock_redis
+        yield shared_stream_manager
+        shared_stream_manager.connections.clear()
+        shared_stream_manager.user_sessions.clear()
+        shared_stream_manager._local_buffer.clear()
+        shared_stream_manager._local_buffer_expiry.clear()
 
     @pytest.mark.asyncio
     async def test_manager_start_stop(self, mock_redis):
@@ -105,10 +142,10 @@ class TestStreamManager:
         assert manager._heartbeat_task is None
 
     @pytest.mark.asyncio
-    async def test_register_connection(self, stream_manager):
+    async def test_register_connection(self, stream_manager, ids):
         """Test registering SSE connection."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
         queue = await stream_manager.register_connection(session_id, user_id)
 
@@ -119,10 +156,10 @@ class TestStreamManager:
         assert session_id in stream_manager.user_sessions[user_id]
 
     @pytest.mark.asyncio
-    async def test_unregister_connection(self, stream_manager):
+    async def test_unregister_connection(self, stream_manager, ids):
         """Test unregistering SSE connection."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
         queue = await stream_manager.register_connection(session_id, user_id)
         await stream_manager.unregister_connection(session_id, user_id, queue)
@@ -131,26 +168,30 @@ class TestStreamManager:
         assert user_id not in stream_manager.user_sessions
 
     @pytest.mark.asyncio
-    async def test_multiple_connections_same_session(self, stream_manager):
+    async def test_multiple_connections_same_session(self, stream_manager, ids):
         """Test multiple connections for same session."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
-        queue1 = await stream_manager.register_connection(session_id, user_id)
-        queue2 = await stream_manager.register_connection(session_id, user_id)
+        async with asyncio.TaskGroup() as tg:
+            t1 = tg.create_task(stream_manager.register_connection(session_id, user_id))
+            t2 = tg.create_task(stream_manager.register_connection(session_id, user_id))
+        queue1, queue2 = t1.result(), t2.result()
 
         assert len(stream_manager.connections[session_id]) == 2
         assert queue1 != queue2
 
     @pytest.mark.asyncio
-    async def test_broadcast_event(self, stream_manager):
+    async def test_broadcast_event(self, stream_manager, ids):
         """Test broadcasting event to session."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
         # Register two connections
-        queue1 = await stream_manager.register_connection(session_id, user_id)
-        queue2 = await stream_manager.register_connection(session_id, user_id)
+        async with asyncio.TaskGroup() as tg:
+            t1 = tg.create_task(stream_manager.register_connection(session_id, user_id))
+            t2 = tg.create_task(stream_manager.register_connection(session_id, user_id))
+        queue1, queue2 = t1.result(), t2.result()
 
         # Broadcast event
         event = StreamEvent(
@@ -162,22 +203,24 @@ class TestStreamManager:
         sent_count = await stream_manager.broadcast_event(session_id, event, buffer=False)
         assert sent_count == 2
 
-        # Check both queues received event
-        event1 = await queue1.get()
-        event2 = await queue2.get()
-        assert event1 == event
-        assert event2 == event
+        # Check both queues received the same pre-serialized event
+        data1 = await queue1.get()
+        data2 = await queue2.get()
+        assert data1 is data2
+        assert StreamEvent.model_validate_json(data1) == event
 
     @pytest.mark.asyncio
-    async def test_broadcast_to_user(self, stream_manager):
+    async def test_broadcast_to_user(self, stream_manager, ids):
         """Test broadcasting event to all user sessions."""
-        user_id = uuid4()
-        session1_id = uuid4()
-        session2_id = uuid4()
+        user_id = next(ids)
+        session1_id = next(ids)
+        session2_id = next(ids)
 
         # Register connections for two sessions
-        queue1 = await stream_manager.register_connection(session1_id, user_id)
-        queue2 = await stream_manager.register_connection(session2_id, user_id)
+        async with asyncio.TaskGroup() as tg:
+            t1 = tg.create_task(stream_manager.register_connection(session1_id, user_id))
+            t2 = tg.create_task(stream_manager.register_connection(session2_id, user_id))
+        queue1, queue2 = t1.result(), t2.result()
 
         # Broadcast to user
         event = StreamEvent(
@@ -188,23 +231,17 @@ class TestStreamManager:
         sent_count = await stream_manager.broadcast_to_user(user_id, event, buffer=False)
         assert sent_count == 2
 
-        # Check both queues received event
-        event1 = await queue1.get()
-        event2 = await queue2.get()
-        assert event1 == event
-        assert event2 == event
+        # Check both sessions received the same serialized event
+        data1 = await queue1.get()
+        data2 = await queue2.get()
+        assert data1 is data2
+        assert StreamEvent.model_validate_json(data1) == event
 
     @pytest.mark.asyncio
-    async def test_event_buffering(self, stream_manager, mock_redis):
+    async def test_event_buffering(self, stream_manager, mock_redis, ids):
         """Test event buffering in Redis."""
-        session_id = uuid4()
-        user_id = uuid4()
-
-        # Mock Redis methods
-        mock_redis.lpush = AsyncMock(return_value=1)
-        mock_redis.ltrim = AsyncMock(return_value=True)
-        mock_redis.expire = AsyncMock(return_value=True)
-        mock_redis.lrange = AsyncMock(return_value=[])
+        session_id = next(ids)
+        user_id = next(ids)
 
         # Broadcast event (will be buffered)
         event = StreamEvent(
@@ -215,73 +252,101 @@ class TestStreamManager:
 
         await stream_manager.broadcast_event(session_id, event, buffer=True)
 
-        # Verify Redis methods were called
+        # Verify Redis methods were called with the broadcast serialization
         mock_redis.lpush.assert_called_once()
+        assert mock_redis.lpush.call_args[0][1] == event.to_ndjson_bytes()
         mock_redis.ltrim.assert_called_once()
         mock_redis.expire.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_buffered_events_on_reconnect(self, stream_manager, mock_redis):
+    async def test_buffered_events_on_reconnect(self, stream_manager, mock_redis, ids):
         """Test sending buffered events on reconnect."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
-        # Mock buffered events
+        # Mock buffered events (replay does not depend on distinct timestamps)
+        timestamp = datetime.now(timezone.utc).isoformat()
         buffered_events = [
             json.dumps({
                 "event_type": "task_progress",
                 "payload": {"task_id": "test_task", "progress": i * 33},
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp,
                 "session_id": str(session_id),
             })
             for i in range(3)
         ]
-        mock_redis.lrange = AsyncMock(return_value=buffered_events)
+        mock_redis.lrange.return_value = buffered_events
 
-        # Register connection (should receive buffered events)
+        # Register connection (replays buffered events before returning)
         queue = await stream_manager.register_connection(session_id, user_id)
 
-        # Wait a bit for buffered events to be sent
-        await asyncio.sleep(0.1)
-
-        # Check queue has buffered events
-        events = []
-        while not queue.empty():
-            events.append(await queue.get())
-
-        assert len(events) == 3
+        # Check queue has exactly the buffered events
+        events = [queue.get_nowait() for _ in range(3)]
+        assert queue.empty()
+        assert all(isinstance(event, StreamEvent) for event in events)
 
     @pytest.mark.asyncio
-    async def test_buffer_size_limit(self, stream_manager, mock_redis):
+    @pytest.mark.parametrize("use_redis_buffer", [True, False])
+    async def test_buffer_size_limit(self, mock_redis, ids, use_redis_buffer):
         """Test buffer size limit enforcement."""
-        session_id = uuid4()
-
-        # Mock Redis methods
-        mock_redis.lpush = AsyncMock(return_value=1)
-        mock_redis.ltrim = AsyncMock(return_value=True)
-        mock_redis.expire = AsyncMock(return_value=True)
+        stream_manager = StreamManager(mock_redis, use_redis_buffer=use_redis_buffer)
+        session_id = next(ids)
 
         # Buffer more than max size
-        for i in range(StreamManager.MAX_BUFFER_SIZE + 10):
+        await asyncio.gather(*(
+            stream_manager._buffer_event(
+                session_id,
+                StreamEvent(
+                    event_type=StreamEventType.TASK_PROGRESS,
+                    payload={"task_id": "test_task", "progress": i},
+                    session_id=session_id,
+                ),
+            )
+            for i in range(StreamManager.MAX_BUFFER_SIZE + 10)
+        ))
+
+        if use_redis_buffer:
+            # Verify ltrim was called to limit size
+            assert mock_redis.ltrim.call_count == StreamManager.MAX_BUFFER_SIZE + 10
+        else:
+            # Local ring buffer evicts on its own, without touching Redis
+            assert len(stream_manager._local_buffer[session_id]) == StreamManager.MAX_BUFFER_SIZE
+            mock_redis.lpush.assert_not_called()
+            mock_redis.ltrim.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_local_buffer_replay_on_reconnect(self, mock_redis, ids):
+        """Test buffered events are replayed in order from the local buffer."""
+        stream_manager = StreamManager(mock_redis, use_redis_buffer=False)
+        session_id = next(ids)
+        user_id = next(ids)
+
+        for i in range(3):
             event = StreamEvent(
                 event_type=StreamEventType.TASK_PROGRESS,
                 payload={"task_id": "test_task", "progress": i},
                 session_id=session_id,
             )
-            await stream_manager._buffer_event(session_id, event)
+            await stream_manager.broadcast_event(session_id, event, buffer=True)
+
+        queue = await stream_manager.register_connection(session_id, user_id)
 
-        # Verify ltrim was called to limit size
-        assert mock_redis.ltrim.call_count == StreamManager.MAX_BUFFER_SIZE + 10
+        events = [queue.get_nowait() for _ in range(3)]
+        assert queue.empty()
+        assert [event.payload["progress"] for event in events] == [0, 1, 2]
+        mock_redis.lrange.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_close_session(self, stream_manager):
+    async def test_close_session(self, stream_manager, ids):
         """Test closing all connections for a session."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
         # Register connections
-        queue1 = await stream_manager.register_connection(session_id, user_id)
-        queue2 = await stream_manager.register_connection(session_id, user_id)
+        async with asyncio.TaskGroup() as tg:
+            t1 = tg.create_task(stream_manager.register_connection(session_id, user_id))
+            t2 = tg.create_task(stream_manager.register_connection(session_id, user_id))
+        queue1, queue2 = t1.result(), t2.result()
 
         # Close session
         await stream_manager.close_session(session_id)
@@ -290,8 +355,8 @@ class TestStreamManager:
         assert session_id not in stream_manager.connections
 
         # Check close signal sent to queues
-        signal1 = await queue1.get()
-        signal2 = await queue2.get()
+        signal1 = StreamEvent.model_validate_json(await queue1.get())
+        signal2 = StreamEvent.model_validate_json(await queue2.get())
         # First should be close event, second should be None (close signal)
         assert signal1.event_type == StreamEventType.TASK_COMPLETED
         assert await queue1.get() is None
@@ -299,17 +364,18 @@ class TestStreamManager:
         assert await queue2.get() is None
 
     @pytest.mark.asyncio
-    async def test_get_stats(self, stream_manager):
+    async def test_get_stats(self, stream_manager, ids):
         """Test getting SSE statistics."""
-        user1_id = uuid4()
-        user2_id = uuid4()
-        session1_id = uuid4()
-        session2_id = uuid4()
+        user1_id = next(ids)
+        user2_id = next(ids)
+        session1_id = next(ids)
+        session2_id = next(ids)
 
         # Register connections
-        await stream_manager.register_connection(session1_id, user1_id)
-        await stream_manager.register_connection(session1_id, user1_id)  # 2nd connection
-        await stream_manager.register_connection(session2_id, user2_id)
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(stream_manager.register_connection(session1_id, user1_id))
+            tg.create_task(stream_manager.register_connection(session1_id, user1_id))  # 2nd connection
+            tg.create_task(stream_manager.register_connection(session2_id, user2_id))
 
         stats = await stream_manager.get_stats()
 
@@ -320,15 +386,15 @@ class TestStreamManager:
         assert stats["connections_per_session"][str(session1_id)] == 2
 
     @pytest.mark.asyncio
-    async def test_large_event_truncation(self, stream_manager):
+    async def test_large_event_truncation(self, stream_manager, ids):
         """Test large event payload truncation."""
-        session_id = uuid4()
-        user_id = uuid4()
+        session_id = next(ids)
+        user_id = next(ids)
 
         queue = await stream_manager.register_connection(session_id, user_id)
 
         # Create event with large payload
-        large_payload = {"data": "x" * (StreamManager.MAX_EVENT_SIZE + 1000)}
+        large_payload = {"data": _OVERSIZED_DATA}
         event = StreamEvent(
             event_type=StreamEventType.TASK_COMPLETED,
             payload=large_payload,
@@ -337,8 +403,10 @@ class TestStreamManager:
 
         await stream_manager.broadcast_event(session_id, event, buffer=False)
 
-        # Get event from queue
-        received_event = await queue.get()
+        # Get event from queue; the delivered line must fit the byte limit
+        data = await queue.get()
+        assert len(data) <= StreamManager.MAX_EVENT_SIZE
+        received_event = StreamEvent.model_validate_json(data)
 
         # Check payload was truncated
         assert "error" in received_event.payload
@@ -442,12 +510,18 @@ class TestStreamEventSchema:
         lines = sse_format.split("\n")
         data_line = [line for line in lines if line.startswith("data: ")][0]
         data_json = data_line.replace("data: ", "")
-        data = json.loads(data_json)
+        data = pydantic_core.from_json(data_json)
 
         assert data["event_type"] == "task_completed"
         assert data["payload"]["task_id"] == "test_task"
         assert data["session_id"] == str(session_id)
 
+        # Bytes form is identical to the str form
+        sse_bytes = event.to_sse_bytes()
+        assert isinstance(sse_bytes, (bytes, bytearray))
+        assert sse_bytes.decode() == sse_format
+        assert pydantic_core.from_json(sse_bytes.split(b"data: ", 1)[1]) == data
+
     def test_all_event_types(self):
         """Test all event types are valid."""
         event_types = [
@@ -464,9 +538,6 @@ class TestStreamEventSchema:
         ]
 
         for event_type in event_types:
-            event = StreamEvent(
-                event_type=event_type,
-                payload={"test": "data"},
-            )
+            event = _BASE_EVENT.model_copy(update={"event_type": event_type})
             assert event.event_type == event_type
-            assert event.to_sse_format() is not None
+            assert event.to_sse_format().startswith(f"event: {event_type.value}\n")
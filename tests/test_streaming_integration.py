@@ -1,344 +1,17 @@
-"""Tests for streaming integration with outbox pattern - Group 4 Tasks 4.3-4.4.
+"""Smoke test for streaming integration with outbox pattern - Group 4 Tasks 4.3-4.4.
 
-Tests verify that:
-1. Domain events are published ONLY through OutboxPublisher (not direct broadcast)
-2. Streaming reflects only committed events from event_outbox
-3. Technical events can still use direct streaming for low-latency delivery
+The architecture invariants (outbox-only domain events, committed-only
+streaming, direct technical events) are documented in
+doc/architecture/streaming-outbox-invariants.md.
 """
 
-import pytest
 
+def test_outbox_publisher_imports():
+    """Outbox → streaming path modules import and expose their entry points."""
+    from app.core.outbox_publisher import OutboxPublisher
+    from app.core.outbox_repository import OutboxRepository
+    from app.core.stream_manager import StreamManager
 
-class TestStreamingIntegrationArchitecture:
-    """Architecture verification for streaming integration (Group 4)."""
-
-    def test_4_3_domain_events_published_only_through_outbox_publisher(self):
-        """Task 4.3: Verify domain events use OutboxPublisher, not direct broadcast.
-        
-        Verification (code review):
-        ✅ project_chat.py line 453-454: Explicit comment "Domain events published only through OutboxPublisher"
-        ✅ project_chat.py line 240-251: message_created recorded via OutboxRepository.record_event()
-        ✅ project_chat.py line 431-450: assistant message events recorded via OutboxRepository
-        ✅ project_chat.py lines 260-271: REMOVED direct MESSAGE_CREATED broadcast
-        ✅ user_worker_space.py line 838-854: agent_switched recorded via OutboxRepository.record_event()
-        ✅ user_worker_space.py line 855: await self.db.commit() ensures atomic persistence
-        ✅ user_worker_space.py: REMOVED direct AGENT_SWITCHED broadcast
-        ✅ app/core/outbox_publisher.py: Background service publishes pending events via StreamManager
-        ✅ app/main.py: OutboxPublisher lifecycle managed (startup/shutdown)
-        
-        Architecture ensured: Domain events flow through:
-        request-path: domain write + outbox record → commit
-        → background: OutboxPublisher polls → StreamManager.broadcast_event()
-        """
-        assert True, "Task 4.3: Domain events use OutboxPublisher only"
-
-    def test_4_4_streaming_reflects_only_committed_events(self):
-        """Task 4.4: Verify streaming only receives events after commit to event_outbox.
-        
-        Consistency guarantees:
-        ✅ Atomicity: OutboxRepository.record_event() called within same transaction as domain write
-        ✅ Durability: Explicit await self.db.commit() persists to event_outbox before streaming
-        ✅ Idempotency: event_outbox.id used as event_id for deduplication
-        ✅ Reliability: OutboxPublisher retry logic prevents event loss
-        
-        Request-path transaction:
-        1. Domain write (Message.add())
-        2. OutboxRepository.record_event() in same session
-        3. await self.db.flush() writes to buffer
-        4. await self.db.commit() persists event_outbox + Message atomically
-        5. Transaction commits successfully
-        
-        Background publisher:
-        1. OutboxPublisher.poll_and_publish() runs every 5s
-        2. Selects pending events with FOR UPDATE SKIP LOCKED
-        3. Publishes via StreamManager.broadcast_event()
-        4. Updates status to 'published' (or 'failed' with retry)
-        
-        Consistency property: Streaming events = committed event_outbox records
-        - No events lost if streaming fails (stored in outbox)
-        - No double-streaming if broadcast fails (idempotent event_id)
-        - No uncommitted events streamed (transaction boundary respected)
-        """
-        assert True, "Task 4.4: Streaming reflects only committed events"
-
-    def test_heartbeat_technical_events_use_direct_streaming(self):
-        """Task 4.3 - Ensure technical events still use direct streaming.
-        
-        Technical events (NOT going through outbox):
-        - heartbeat: sent every 30s by StreamManager._heartbeat_loop()
-        - error: sent immediately by route handlers for user feedback
-        - task_completed: sent immediately after execution
-        
-        Why direct streaming for technical events:
-        1. Ephemeral: not tied to domain model, don't need persistence
-        2. Low-latency: heartbeat and errors need immediate delivery
-        3. No consistency requirement: operational status, not business events
-        
-        Implementation verified:
-        ✅ stream_manager.py line 37-50: heartbeat sent directly via StreamConnection.send_heartbeat()
-        ✅ stream_manager.py line 316-341: _heartbeat_loop() sends every HEARTBEAT_INTERVAL (30s)
-        ✅ project_chat.py line 457-470: task_completed broadcast directly (not domain event)
-        ✅ project_chat.py line 490-500: error broadcast directly for immediate feedback
-        ✅ Routes: error events bypass outbox for immediate user notification
-        """
-        assert True, "Task 4.3: Technical events use direct streaming for low-latency"
-
-    def test_message_created_no_direct_broadcast_removed(self):
-        """Verify direct MESSAGE_CREATED broadcast was removed from request-path.
-        
-        Code change verification:
-        ✅ Old code (removed): app/routes/project_chat.py lines 260-271
-           - Was broadcasting StreamEventType.MESSAGE_CREATED directly
-           - Broke consistency if streaming failed but message was persisted
-        
-        ✅ New code: OutboxRepository.record_event() at line 240-251
-           - Records event within same transaction as message
-           - OutboxPublisher publishes asynchronously with retry logic
-           
-        Correctness verified:
-        - Event is persisted in event_outbox table
-        - Event gets published through background service
-        - Ensures "no events lost" property
-        """
-        assert True, "MESSAGE_CREATED broadcast removed from request-path"
-
-    def test_agent_switched_no_direct_broadcast_removed(self):
-        """Verify direct AGENT_SWITCHED broadcast was removed from request-path.
-        
-        Code change verification:
-        ✅ Old code (removed): app/core/user_worker_space.py lines 818-847
-           - Was broadcasting agent_switched event directly in if session_id: block
-           - Would have had race condition if streaming failed
-           
-        ✅ New code: OutboxRepository.record_event() at line 838-854
-           - Records event in same transaction as agent_switch_message
-           - await self.db.commit() at line 855 ensures atomicity
-           
-        Correctness verified:
-        - Domain model write (agent_switch_message) and event_outbox write atomic
-        - OutboxPublisher handles publication with retry
-        - Consistent state guaranteed even if streaming fails
-        """
-        assert True, "AGENT_SWITCHED broadcast removed from request-path"
-
-    def test_outbox_provides_exactly_once_semantics(self):
-        """Verify outbox pattern provides exactly-once event delivery semantics.
-        
-        Exactly-once achieved through:
-        
-        1. Atomic write to event_outbox:
-           ✅ OutboxRepository.record_event() in same transaction as domain write
-           ✅ Commit is atomic: either both written or both rolled back
-           
-        2. Idempotent publication:
-           ✅ event_outbox.id is stable UUID
-           ✅ Consumers deduplicate based on event_id
-           ✅ Multiple publishes of same event have same event_id
-           
-        3. Reliable retry:
-           ✅ OutboxPublisher retry logic with exponential backoff
-           ✅ Status tracking: pending → published/failed
-           ✅ retry_count and next_retry_at prevent infinite retries
-           
-        4. Durable storage:
-           ✅ event_outbox table stores all events until published
-           ✅ Survives publisher crashes/restarts
-           ✅ Analytics can use event_outbox as source of truth
-        """
-        assert True, "Outbox pattern provides exactly-once semantics"
-
-    def test_user_project_isolation_in_events(self):
-        """Verify events maintain user and project isolation.
-        
-        Isolation mechanism:
-        ✅ EventOutbox model: user_id and project_id mapped columns
-        ✅ Database indexes for (user_id, created_at) and (project_id, created_at)
-        ✅ OutboxRepository.record_event() requires user_id and project_id
-        ✅ OutboxPublisher includes both in published event payload
-        
-        Multi-tenant guarantees:
-        - Analytics queries scoped by user_id/project_id
-        - Events never leak between users or projects
-        - Consumer can validate isolation and reject cross-user events
-        """
-        assert True, "Events maintain user and project isolation"
-
-    def test_no_direct_domain_event_broadcasts_in_codebase(self):
-        """Verify no other direct broadcasts for domain events exist.
-        
-        Code patterns checked:
-        ✅ project_chat.py: MESSAGE_CREATED uses outbox, not direct broadcast
-        ✅ user_worker_space.py: AGENT_SWITCHED uses outbox, not direct broadcast
-        ✅ All direct broadcasts in routes/streams are for technical events
-        ✅ stream_manager.broadcast_event() never called with domain event types
-        ✅ Only OutboxPublisher calls stream_manager.broadcast_event() for domain events
-        
-        Search results verified:
-        - broadcast_event calls in outbox_publisher.py ✅ (correct)
-        - broadcast_event calls in project_chat.py are for task_completed/error ✅ (technical, OK)
-        - broadcast_event calls elsewhere are for technical/operational events ✅ (OK)
-        - No other domain event broadcasts found ✅ (verified)
-        """
-        assert True, "No direct domain event broadcasts found in codebase"
-
-
-class TestStreamingConsistencyProperties:
-    """Test consistency properties of the streaming architecture."""
-
-    def test_consistency_property_at_least_once_delivery(self):
-        """Verify at-least-once delivery semantics.
-        
-        Guarantee: Every event written to event_outbox will eventually be published
-        to streaming (possibly with retries).
-        
-        Mechanism:
-        1. Event persisted in event_outbox on commit (durable write)
-        2. OutboxPublisher polls event_outbox for pending events
-        3. Publishes to StreamManager and updates status
-        4. On failure: increases retry_count, schedules next_retry_at
-        5. On max retries: marks as 'failed' but doesn't lose data
-        
-        Property guaranteed by:
-        ✅ event_outbox is durable storage
-        ✅ OutboxPublisher runs continuously
-        ✅ Retry logic with exponential backoff
-        ✅ Status tracking prevents infinite loops
-        """
-        assert True, "At-least-once delivery guaranteed"
-
-    def test_consistency_property_idempotent_streaming(self):
-        """Verify idempotent streaming (safe to process duplicate events).
-        
-        Guarantee: Consumer receiving the same event_id multiple times can safely
-        deduplicate without generating duplicate state.
-        
-        Mechanism:
-        1. event_outbox.id is stable UUID (never changes)
-        2. OutboxPublisher includes id in payload as event_id
-        3. OutboxPublisher updates status after publish (prevents replay)
-        4. Consumer deduplicates based on event_id
-        
-        Property guaranteed by:
-        ✅ Primary key (id) is UUID
-        ✅ status field tracks publication state
-        ✅ Consumer contract requires event_id deduplication
-        """
-        assert True, "Idempotent streaming supported"
-
-    def test_consistency_property_transactional_writes(self):
-        """Verify transactional write consistency.
-        
-        Guarantee: Domain model write and event_outbox write are atomic.
-        
-        Implementation:
-        1. Domain write: message.add()/agent_switch_message.add()
-        2. await session.flush() - writes to buffer
-        3. OutboxRepository.record_event() - adds event_outbox record to same session
-        4. await session.commit() - commits both atomically
-        
-        Atomicity guaranteed by:
-        ✅ Single AsyncSession transaction
-        ✅ Explicit commit after both writes
-        ✅ Rollback on any error before commit
-        
-        Failure scenarios handled:
-        ✅ Message write fails → event not recorded (OK, rollback)
-        ✅ Event record fails → message not persisted (OK, rollback)
-        ✅ Commit fails → both rolled back (OK, retry from client)
-        ✅ Both succeed → both committed (OK, event will be published)
-        """
-        assert True, "Transactional write consistency guaranteed"
-
-
-class TestStreamingIntegrationGroup4Summary:
-    """Summary of Group 4 streaming integration implementation."""
-
-    def test_group_4_1_complete_direct_broadcasts_removed(self):
-        """Group 4.1: ✅ COMPLETE - Removed direct domain event broadcasts.
-        
-        Changes made:
-        ✅ Removed MESSAGE_CREATED direct broadcast from project_chat.py
-        ✅ Removed AGENT_SWITCHED direct broadcast from user_worker_space.py
-        ✅ Added comment explaining outbox-only publication model
-        ✅ Verified no other direct domain event broadcasts exist
-        
-        Architecture result:
-        Domain events flow: request-path → outbox → OutboxPublisher → StreamManager
-        """
-        assert True, "Group 4.1: Direct broadcasts removed"
-
-    def test_group_4_2_complete_outbox_recording_integrated(self):
-        """Group 4.2: ✅ COMPLETE - Outbox recording integrated.
-        
-        Changes made:
-        ✅ OutboxRepository.record_event() called in project_chat.py for messages
-        ✅ OutboxRepository.record_event() called in user_worker_space.py for agent_switched
-        ✅ Explicit await self.db.commit() for atomic persistence
-        ✅ Events recorded with proper metadata (user_id, project_id, payload)
-        
-        Architecture result:
-        All domain events written atomically with domain models
-        """
-        assert True, "Group 4.2: Outbox recording integrated"
-
-    def test_group_4_3_complete_technical_events_preserved(self):
-        """Group 4.3: ✅ COMPLETE - Technical events preserved.
-        
-        Verification:
-        ✅ heartbeat: StreamManager._heartbeat_loop() sends direct (technical)
-        ✅ error: Route handlers broadcast directly (technical)
-        ✅ task_completed: project_chat.py broadcasts directly (technical)
-        ✅ Only domain events use outbox
-        
-        Architecture result:
-        Technical events have low-latency direct path
-        Domain events have reliable outbox path
-        """
-        assert True, "Group 4.3: Technical events use direct streaming"
-
-    def test_group_4_4_complete_committed_only_streaming(self):
-        """Group 4.4: ✅ COMPLETE - Streaming reflects committed state.
-        
-        Verification:
-        ✅ Events only in streaming after commit to event_outbox
-        ✅ OutboxPublisher polls committed pending events
-        ✅ Rollback prevents event streaming
-        ✅ Atomic transaction ensures consistency
-        
-        Architecture result:
-        Streaming = committed event_outbox records
-        No event loss, exactly-once semantics, idempotent delivery
-        """
-        assert True, "Group 4.4: Streaming reflects committed state only"
-
-    def test_group_4_complete_summary(self):
-        """Group 4: ✅ COMPLETE (4/4 tasks) - Streaming Integration.
-        
-        Overall architecture:
-        
-        Request-path (synchronous):
-        Domain write (Message/ChatSession) 
-        → OutboxRepository.record_event() (same transaction)
-        → await db.commit() (atomic)
-        
-        Response: Success to client
-        
-        Background (asynchronous):
-        OutboxPublisher.poll_and_publish() (every 5s)
-        → Get pending events from event_outbox (FOR UPDATE SKIP LOCKED)
-        → StreamManager.broadcast_event() (publish to subscribers)
-        → Update status (pending → published/failed)
-        → Retry with backoff if failed
-        
-        Guarantees achieved:
-        ✅ Strict consistency: domain write + event_outbox atomic
-        ✅ Reliability: events durably stored, retried on failure
-        ✅ Idempotency: event_id = event_outbox.id for deduplication
-        ✅ Isolation: user_id and project_id prevent data leaks
-        ✅ Latency: technical events bypass outbox for low-latency
-        ✅ Resilience: survives streaming failures and publisher crashes
-        
-        Result: Event Log + Outbox pattern successfully implemented
-        Next groups: Analytics (5), Idempotency (6), Observability (7), Docs (8)
-        """
-        assert True, "Group 4: Streaming Integration COMPLETE"
+    assert callable(OutboxRepository.record_event)
+    assert callable(OutboxPublisher.start)
+    assert callable(StreamManager.broadcast_event)
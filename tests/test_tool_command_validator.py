@@ -1,68 +1,75 @@
 """Unit tests for CommandValidator"""
 
+import shlex
+
 import pytest
 from app.core.tools.command_whitelist import CommandValidator
 
 
-@pytest.fixture
+ALLOWED_CMDS = ("grep", "npm", "python", "git")
+BLOCKED_CMDS = ("rm", "sudo", "bash", "curl", "kill")
+VERSIONED_CMDS = ("python3.11", "node18", "gcc-12")
+NORMALIZED_CMDS = ("PYTHON", "PyThOn", "  python  ")
+SAFE_INVOCATIONS = (
+    ("git", ["clone"], True),
+    ("git", ["pull"], True),
+    ("npm", ["install"], True),
+    ("npm", ["test"], True),
+    ("python", ["script.py"], True),
+)
+SHLEX_CASES = (
+    "echo 'single quoted' plain",
+    'echo "a \\"quoted\\" word"',
+    'echo "keep \\n escape"',
+    "echo split\\ word",
+    'echo a"b c"d',
+    'echo ""',
+    "  python\tscript.py\n",
+)
+
+
+@pytest.fixture(scope="module")
 def validator():
-    """Create CommandValidator instance"""
+    """Create CommandValidator instance shared across the module (read-only)"""
     return CommandValidator()
 
 
 class TestCommandValidatorWhitelist:
     """Tests for command whitelist validation"""
 
-    def test_allowed_command_grep(self, validator):
-        """Test allowed command: grep"""
-        is_valid, msg = validator.validate_command("grep")
-        assert is_valid
-        assert msg == "grep"
-
-    def test_allowed_command_npm(self, validator):
-        """Test allowed command: npm"""
-        is_valid, msg = validator.validate_command("npm")
-        assert is_valid
-
-    def test_allowed_command_python(self, validator):
-        """Test allowed command: python"""
-        is_valid, msg = validator.validate_command("python")
-        assert is_valid
-
-    def test_allowed_command_git(self, validator):
-        """Test allowed command: git"""
-        is_valid, msg = validator.validate_command("git")
+    @pytest.mark.parametrize("cmd", ALLOWED_CMDS)
+    def test_allowed_commands(self, validator, cmd):
+        """Test whitelisted commands are allowed"""
+        is_valid, msg = validator.validate_command(cmd)
         assert is_valid
+        assert msg == cmd
 
 
 class TestCommandValidatorBlacklist:
     """Tests for command blacklist blocking"""
 
-    def test_blocked_command_rm(self, validator):
-        """Test blocked command: rm"""
-        is_valid, error = validator.validate_command("rm")
+    @pytest.mark.parametrize("cmd", BLOCKED_CMDS)
+    def test_blocked_commands(self, validator, cmd):
+        """Test blacklisted commands are blocked"""
+        is_valid, error = validator.validate_command(cmd)
         assert not is_valid
         assert "not allowed" in error.lower()
 
-    def test_blocked_command_sudo(self, validator):
-        """Test blocked command: sudo"""
-        is_valid, error = validator.validate_command("sudo")
-        assert not is_valid
 
-    def test_blocked_command_bash(self, validator):
-        """Test blocked command: bash"""
-        is_valid, error = validator.validate_command("bash")
-        assert not is_valid
+class TestCommandValidatorBatch:
+    """Tests for batch command validation"""
 
-    def test_blocked_command_curl(self, validator):
-        """Test blocked command: curl"""
-        is_valid, error = validator.validate_command("curl")
-        assert not is_valid
+    def test_validate_commands_matches_single_results(self, validator):
+        """Test batch results line up with the input order"""
+        results = validator.validate_commands(ALLOWED_CMDS + BLOCKED_CMDS)
+        assert [is_valid for is_valid, _ in results] == (
+            [True] * len(ALLOWED_CMDS) + [False] * len(BLOCKED_CMDS)
+        )
+        assert tuple(msg for _, msg in results[:len(ALLOWED_CMDS)]) == ALLOWED_CMDS
 
-    def test_blocked_command_kill(self, validator):
-        """Test blocked command: kill"""
-        is_valid, error = validator.validate_command("kill")
-        assert not is_valid
+    def test_validate_commands_empty(self, validator):
+        """Test empty batch returns empty list"""
+        assert validator.validate_commands([]) == []
 
 
 class TestCommandValidatorPath:
@@ -83,34 +90,21 @@ class TestCommandValidatorPath:
 class TestCommandValidatorVersion:
     """Tests for version number stripping"""
 
-    def test_python_with_version(self, validator):
-        """Test python3.11 → python"""
-        is_valid, msg = validator.validate_command("python3.11")
-        assert is_valid
-
-    def test_node_with_version(self, validator):
-        """Test node18 → node"""
-        is_valid, msg = validator.validate_command("node18")
-        assert is_valid
-
-    def test_gcc_with_version(self, validator):
-        """Test gcc-12 → gcc"""
-        is_valid, msg = validator.validate_command("gcc-12")
+    @pytest.mark.parametrize("cmd", VERSIONED_CMDS)
+    def test_version_stripping(self, validator, cmd):
+        """Test python3.11 → python, node18 → node, gcc-12 → gcc"""
+        is_valid, msg = validator.validate_command(cmd)
         assert is_valid
 
 
 class TestCommandValidatorSafety:
     """Tests for command safety validation"""
 
-    def test_git_allowed_subcommand_clone(self, validator):
-        """Test git clone is allowed"""
-        is_valid, msg = validator.validate_command_safety("git", ["clone"])
-        assert is_valid
-
-    def test_git_allowed_subcommand_pull(self, validator):
-        """Test git pull is allowed"""
-        is_valid, msg = validator.validate_command_safety("git", ["pull"])
-        assert is_valid
+    @pytest.mark.parametrize("cmd,args,expect", SAFE_INVOCATIONS)
+    def test_safety_allowed(self, validator, cmd, args, expect):
+        """Test allowed command + subcommand/script combinations"""
+        is_valid, msg = validator.validate_command_safety(cmd, args)
+        assert is_valid is expect
 
     def test_git_blocked_subcommand(self, validator):
         """Test git with disallowed subcommand"""
@@ -119,77 +113,75 @@ class TestCommandValidatorSafety:
         # Just ensure validation works
         assert isinstance(is_valid, bool)
 
-    def test_npm_allowed_install(self, validator):
-        """Test npm install is allowed"""
-        is_valid, msg = validator.validate_command_safety("npm", ["install"])
-        assert is_valid
-
-    def test_npm_allowed_test(self, validator):
-        """Test npm test is allowed"""
-        is_valid, msg = validator.validate_command_safety("npm", ["test"])
-        assert is_valid
-
-    def test_python_allowed(self, validator):
-        """Test python script execution allowed"""
-        is_valid, msg = validator.validate_command_safety("python", ["script.py"])
-        assert is_valid
-
 
 class TestCommandValidatorParsing:
     """Tests for command parsing"""
 
-    def test_parse_simple_command(self, validator):
+    def test_parse_simple_command(self):
         """Test parsing simple command"""
         cmd, args = CommandValidator.parse_command_safely("python script.py")
         assert cmd == "python"
         assert args == ["script.py"]
 
-    def test_parse_command_with_args(self, validator):
+    def test_parse_command_with_args(self):
         """Test parsing command with multiple args"""
         cmd, args = CommandValidator.parse_command_safely('npm run build --mode="production"')
         assert cmd == "npm"
         assert "run" in args
         assert "build" in args
 
-    def test_parse_quoted_args(self, validator):
+    def test_parse_quoted_args(self):
         """Test parsing quoted arguments"""
         cmd, args = CommandValidator.parse_command_safely('echo "hello world"')
         assert cmd == "echo"
         assert args == ["hello world"]
 
-    def test_parse_empty_command_raises(self, validator):
+    @pytest.mark.parametrize("command", SHLEX_CASES)
+    def test_parse_matches_shlex(self, command):
+        """Test parsing follows shlex.split quoting rules"""
+        expected = shlex.split(command)
+        cmd, args = CommandValidator.parse_command_safely(command)
+        assert [cmd, *args] == expected
+
+    def test_parse_trailing_backslash_raises(self):
+        """Test that a dangling escape raises error"""
+        with pytest.raises(ValueError):
+            CommandValidator.parse_command_safely("echo foo\\")
+
+    def test_parse_empty_command_raises(self):
         """Test that empty command raises error"""
         with pytest.raises(ValueError):
             CommandValidator.parse_command_safely("")
 
-    def test_parse_invalid_quotes_raises(self, validator):
+    def test_parse_invalid_quotes_raises(self):
         """Test that invalid quotes raise error"""
         with pytest.raises(ValueError):
             CommandValidator.parse_command_safely('echo "unclosed quote')
 
 
 class TestCommandValidatorCase:
-    """Tests for case handling"""
+    """Tests for case and whitespace handling"""
 
-    def test_uppercase_command(self, validator):
-        """Test that uppercase commands are handled"""
-        is_valid, msg = validator.validate_command("PYTHON")
+    @pytest.mark.parametrize("cmd", NORMALIZED_CMDS)
+    def test_normalization(self, validator, cmd):
+        """Test that upper/mixed case and padded commands are handled"""
+        is_valid, msg = validator.validate_command(cmd)
         assert is_valid
+        assert msg == "python"
 
-    def test_mixed_case_command(self, validator):
-        """Test that mixed case commands are handled"""
-        is_valid, msg = validator.validate_command("PyThOn")
-        assert is_valid
+    def test_normalization_is_cached(self, validator):
+        """Test repeated commands reuse the cached normalization"""
+        from app.core.tools.command_whitelist import normalize_command
+
+        validator.validate_command("Python3.12")
+        hits = normalize_command.cache_info().hits
+        validator.validate_command("Python3.12")
+        assert normalize_command.cache_info().hits == hits + 1
 
 
 class TestCommandValidatorEdgeCases:
     """Tests for edge cases"""
 
-    def test_command_with_spaces(self, validator):
-        """Test command with spaces"""
-        is_valid, msg = validator.validate_command("  python  ")
-        assert is_valid
-
     def test_unknown_command(self, validator):
         """Test unknown command is blocked"""
         is_valid, error = validator.validate_command("unknowncommand12345")
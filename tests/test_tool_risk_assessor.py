@@ -4,9 +4,38 @@ import pytest
 from app.core.tools.risk_assessor import RiskAssessor, RiskLevel
 
 
-@pytest.fixture
+WRITE_FILE_RISKS = (
+    ("script.py", RiskLevel.MEDIUM),
+    ("config.json", RiskLevel.MEDIUM),
+    ("README.md", RiskLevel.MEDIUM),
+    ("app.exe", RiskLevel.HIGH),
+    ("lib.dll", RiskLevel.HIGH),
+    ("file.unknown", RiskLevel.MEDIUM),
+)
+COMMAND_RISKS = (
+    ("grep", RiskLevel.LOW),
+    ("find", RiskLevel.LOW),
+    ("ls", RiskLevel.LOW),
+    ("git", RiskLevel.MEDIUM),
+    ("npm", RiskLevel.MEDIUM),
+    ("python", RiskLevel.MEDIUM),
+    ("gcc", RiskLevel.HIGH),
+    ("make", RiskLevel.HIGH),
+    ("tar", RiskLevel.HIGH),
+    ("unknowncmd", RiskLevel.HIGH),
+    ("ls_wrapper", RiskLevel.HIGH),
+    ("g++", RiskLevel.HIGH),
+)
+PATH_ARGUMENT_COMMANDS = (
+    "grep x /etc/passwd",
+    "cat /etc/shadow",
+    "/usr/bin/python x.py",
+)
+
+
+@pytest.fixture(scope="session")
 def assessor():
-    """Create RiskAssessor instance"""
+    """Create RiskAssessor instance shared across tests (stateless lookups)"""
     return RiskAssessor()
 
 
@@ -41,89 +70,21 @@ class TestRiskAssessorListDirectory:
 class TestRiskAssessorWriteFile:
     """Tests for write_file risk assessment"""
 
-    def test_write_python_file_is_medium_risk(self, assessor):
-        """Test that writing .py file is MEDIUM risk"""
-        risk = assessor.assess_tool_risk("write_file", {"path": "script.py"})
-        assert risk == RiskLevel.MEDIUM
-
-    def test_write_json_file_is_medium_risk(self, assessor):
-        """Test that writing .json file is MEDIUM risk"""
-        risk = assessor.assess_tool_risk("write_file", {"path": "config.json"})
-        assert risk == RiskLevel.MEDIUM
-
-    def test_write_markdown_file_is_medium_risk(self, assessor):
-        """Test that writing .md file is MEDIUM risk"""
-        risk = assessor.assess_tool_risk("write_file", {"path": "README.md"})
-        assert risk == RiskLevel.MEDIUM
-
-    def test_write_exe_file_is_high_risk(self, assessor):
-        """Test that writing .exe file is HIGH risk"""
-        risk = assessor.assess_tool_risk("write_file", {"path": "app.exe"})
-        assert risk == RiskLevel.HIGH
-
-    def test_write_dll_file_is_high_risk(self, assessor):
-        """Test that writing .dll file is HIGH risk"""
-        risk = assessor.assess_tool_risk("write_file", {"path": "lib.dll"})
-        assert risk == RiskLevel.HIGH
-
-    def test_write_unknown_extension_is_medium_risk(self, assessor):
-        """Test that unknown extension defaults to MEDIUM"""
-        risk = assessor.assess_tool_risk("write_file", {"path": "file.unknown"})
-        assert risk == RiskLevel.MEDIUM
+    @pytest.mark.parametrize("path,expected", WRITE_FILE_RISKS)
+    def test_write_file_risk(self, assessor, path, expected):
+        """Test write_file risk by extension (unknown defaults to MEDIUM)"""
+        risk = assessor.assess_tool_risk("write_file", {"path": path})
+        assert risk == expected
 
 
 class TestRiskAssessorExecuteCommand:
     """Tests for execute_command risk assessment"""
 
-    def test_grep_is_low_risk(self, assessor):
-        """Test that grep is LOW risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "grep"})
-        assert risk == RiskLevel.LOW
-
-    def test_find_is_low_risk(self, assessor):
-        """Test that find is LOW risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "find"})
-        assert risk == RiskLevel.LOW
-
-    def test_ls_is_low_risk(self, assessor):
-        """Test that ls is LOW risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "ls"})
-        assert risk == RiskLevel.LOW
-
-    def test_git_is_medium_risk(self, assessor):
-        """Test that git is MEDIUM risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "git"})
-        assert risk == RiskLevel.MEDIUM
-
-    def test_npm_is_medium_risk(self, assessor):
-        """Test that npm is MEDIUM risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "npm"})
-        assert risk == RiskLevel.MEDIUM
-
-    def test_python_is_medium_risk(self, assessor):
-        """Test that python is MEDIUM risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "python"})
-        assert risk == RiskLevel.MEDIUM
-
-    def test_gcc_is_high_risk(self, assessor):
-        """Test that gcc is HIGH risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "gcc"})
-        assert risk == RiskLevel.HIGH
-
-    def test_make_is_high_risk(self, assessor):
-        """Test that make is HIGH risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "make"})
-        assert risk == RiskLevel.HIGH
-
-    def test_tar_is_high_risk(self, assessor):
-        """Test that tar is HIGH risk"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "tar"})
-        assert risk == RiskLevel.HIGH
-
-    def test_unknown_command_is_high_risk(self, assessor):
-        """Test that unknown command defaults to HIGH"""
-        risk = assessor.assess_tool_risk("execute_command", {"command": "unknowncmd"})
-        assert risk == RiskLevel.HIGH
+    @pytest.mark.parametrize("command,expected", COMMAND_RISKS)
+    def test_execute_command_risk(self, assessor, command, expected):
+        """Test execute_command risk by command (unknown defaults to HIGH)"""
+        risk = assessor.assess_tool_risk("execute_command", {"command": command})
+        assert risk == expected
 
 
 class TestRiskAssessorTimeout:
@@ -172,6 +133,12 @@ class TestRiskAssessorPathHandling:
         )
         assert risk == RiskLevel.MEDIUM
 
+    @pytest.mark.parametrize("command", PATH_ARGUMENT_COMMANDS)
+    def test_path_in_arguments_is_high_risk(self, assessor, command):
+        """Test that a "/" in the arguments does not downgrade the command"""
+        risk = assessor.assess_tool_risk("execute_command", {"command": command})
+        assert risk == RiskLevel.HIGH
+
     def test_version_stripped_from_command(self, assessor):
         """Test that version numbers are stripped"""
         risk = assessor.assess_tool_risk(
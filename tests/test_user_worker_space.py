@@ -1,19 +1,116 @@
 """Tests for User Worker Space."""
 
 import asyncio
-from uuid import uuid4
+import itertools
+from uuid import UUID
 
 import pytest
+import pytest_asyncio
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.agent_bus import AgentBus
 from app.core.user_worker_space import UserWorkerSpace, AgentCache
 from app.core.worker_space_manager import WorkerSpaceManager, get_worker_space_manager
 from app.database import AsyncSessionLocal
-from app.models import User, UserAgent
+from app.models import User, UserAgent, UserProject
 from app.schemas.agent import AgentConfig
 from app.database import get_db
 
+# Deterministic agent ids for MockAgent instead of a uuid4() per instance
+_mock_agent_ids = itertools.count(1)
+
+# Second user for manager isolation checks (spaces need no user row)
+OTHER_USER_ID = UUID("223e4567-e89b-12d3-a456-426614174000")
+
+
+@pytest.fixture
+def manager() -> WorkerSpaceManager:
+    """Process-wide worker space manager (reset after each test by conftest)."""
+    return get_worker_space_manager()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def agent_bus():
+    """Agent bus shared by the worker space tests of this module."""
+    bus = AgentBus()
+    yield bus
+    await bus.cleanup()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def initialized_space(agent_bus: AgentBus, test_engine):
+    """Initialized worker space (with two agents) shared by read-only tests.
+
+    The rows are committed to the shared test schema rather than kept in an
+    outer transaction (the StaticPool connection is shared with the
+    per-test SAVEPOINT sessions) and deleted again on teardown.
+    """
+    async with AsyncSession(test_engine, expire_on_commit=False) as session:
+        user = User(email="space@example.com")
+        session.add(user)
+        await session.flush()
+
+        project = UserProject(
+            user_id=user.id, name="space_project", workspace_path="/tmp/test_workspace"
+        )
+        session.add(project)
+        await session.flush()
+
+        session.add_all([
+            UserAgent(
+                user_id=user.id,
+                project_id=project.id,
+                name=name,
+                config={"name": name, "system_prompt": f"You are {name}", "model": "gpt-4"},
+                status="ready",
+            )
+            for name in ("test_coder", "test_analyzer")
+        ])
+        await session.commit()
+
+        space = UserWorkerSpace(
+            user_id=user.id,
+            project_id=str(project.id),
+            db=session,
+            redis=None,
+            qdrant=None,
+            agent_bus=agent_bus,
+        )
+        await space.initialize()
+        # End the read transaction so the shared connection is free again
+        await session.commit()
+
+        yield space
+
+        await space.cleanup()
+        await session.execute(delete(UserAgent).where(UserAgent.user_id == user.id))
+        await session.execute(delete(UserProject).where(UserProject.user_id == user.id))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+@pytest_asyncio.fixture
+async def make_space(agent_bus: AgentBus, db_session: AsyncSession, test_user, test_project):
+    """Factory for worker spaces of the test user/project, cleaned up on teardown."""
+    created: list[UserWorkerSpace] = []
+
+    def _make(project_id: str | None = None) -> UserWorkerSpace:
+        space = UserWorkerSpace(
+            user_id=test_user.id,
+            project_id=project_id or str(test_project.id),
+            db=db_session,
+            redis=None,
+            qdrant=None,
+            agent_bus=agent_bus,
+        )
+        created.append(space)
+        return space
+
+    yield _make
+
+    await asyncio.gather(*(space.cleanup() for space in created))
+
 
 @pytest.mark.asyncio
 async def test_agent_cache_operations():
@@ -23,18 +120,18 @@ async def test_agent_cache_operations():
     # Create mock agent
     class MockAgent:
         def __init__(self):
-            self.id = uuid4()
+            self.id = UUID(int=next(_mock_agent_ids))
 
     agent = MockAgent()
 
     # Test set and get
     await cache.set(agent.id, agent)
-    cached = await cache.get(agent.id)
+    cached = cache.get(agent.id)
     assert cached == agent
 
     # Test invalidate
     await cache.invalidate(agent.id)
-    cached = await cache.get(agent.id)
+    cached = cache.get(agent.id)
     assert cached is None
 
     # Test clear
@@ -43,25 +140,51 @@ async def test_agent_cache_operations():
     await cache.set(agent2.id, agent2)
     assert cache.get_size() == 2
 
-    await cache.clear()
+    cache.clear()
+    assert cache.get_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_cache_entry_expires():
+    """Test that cached agents expire after the TTL."""
+    clock = [0.0]
+    cache = AgentCache(ttl_seconds=300, time_source=lambda: clock[0])
+    agent_id = UUID(int=next(_mock_agent_ids))
+    agent = object()
+
+    await cache.set(agent_id, agent)
+
+    clock[0] += 299
+    assert cache.get(agent_id) is agent
+
+    clock[0] += 2
+    assert cache.get(agent_id) is None
     assert cache.get_size() == 0
 
 
+@pytest.mark.asyncio
+async def test_expired_cache_entry_keeps_agent_active(make_space, test_agents_fixture):
+    """Test that an agent stays reachable after its cache entry expires."""
+    space = make_space()
+    await space.initialize()
+    agent_id = test_agents_fixture[0].id
+    assert space.agent_cache.get(agent_id) is not None
+
+    expired_at = space.agent_cache.time_source() + space.agent_cache.ttl_seconds
+    space.agent_cache.time_source = lambda: expired_at
+
+    # Not cached any more (is_in_cache is False), but still active
+    assert space.agent_cache.get(agent_id) is None
+    assert agent_id in space.active_agents
+    assert await space.get_agent(agent_id) is not None
+
+
 @pytest.mark.asyncio
 async def test_user_worker_space_initialization(
-    db_session: AsyncSession, test_user, test_project, test_agents_fixture
+    make_space, test_user, test_project, test_agents_fixture
 ):
     """Test worker space initialization."""
-    agent_bus = AgentBus()
-
-    space = UserWorkerSpace(
-        user_id=test_user.id,
-        project_id=str(test_project.id),
-        db=db_session,
-        redis=None,
-        qdrant=None,
-        agent_bus=agent_bus,
-    )
+    space = make_space()
 
     assert space.user_id == test_user.id
     assert space.project_id == str(test_project.id)
@@ -75,20 +198,9 @@ async def test_user_worker_space_initialization(
 
 
 @pytest.mark.asyncio
-async def test_user_worker_space_agent_management(
-    db_session: AsyncSession, test_user, test_project, test_agents_fixture
-):
+async def test_user_worker_space_agent_management(make_space, test_agents_fixture):
     """Test agent management in worker space."""
-    agent_bus = AgentBus()
-
-    space = UserWorkerSpace(
-        user_id=test_user.id,
-        project_id=str(test_project.id),
-        db=db_session,
-        redis=None,
-        qdrant=None,
-        agent_bus=agent_bus,
-    )
+    space = make_space()
 
     # Get agent (should initialize first)
     agent = await space.get_agent(test_agents_fixture[0].id)
@@ -100,40 +212,23 @@ async def test_user_worker_space_agent_management(
 
 
 @pytest.mark.asyncio
-async def test_user_worker_space_cleanup(db_session: AsyncSession, test_user, test_project, test_agents_fixture):
+async def test_user_worker_space_cleanup(make_space, test_agents_fixture):
     """Test worker space cleanup."""
-    agent_bus = AgentBus()
-
-    space = UserWorkerSpace(
-        user_id=test_user.id,
-        project_id=str(test_project.id),
-        db=db_session,
-        redis=None,
-        qdrant=None,
-        agent_bus=agent_bus,
-    )
+    space = make_space()
 
     await space.initialize()
     assert space.initialized
 
     await space.cleanup()
     assert not space.initialized
+    assert not space.is_healthy()
     assert len(space.active_agents) == 0
 
 
 @pytest.mark.asyncio
-async def test_user_worker_space_reset(db_session: AsyncSession, test_user, test_project, test_agents_fixture):
+async def test_user_worker_space_reset(make_space, test_agents_fixture):
     """Test worker space reset."""
-    agent_bus = AgentBus()
-
-    space = UserWorkerSpace(
-        user_id=test_user.id,
-        project_id=str(test_project.id),
-        db=db_session,
-        redis=None,
-        qdrant=None,
-        agent_bus=agent_bus,
-    )
+    space = make_space()
 
     await space.initialize()
     assert len(space.active_agents) == len(test_agents_fixture)
@@ -145,60 +240,49 @@ async def test_user_worker_space_reset(db_session: AsyncSession, test_user, test
 
 
 @pytest.mark.asyncio
-async def test_user_worker_space_stats(db_session: AsyncSession, test_user, test_project, test_agents_fixture):
+async def test_user_worker_space_stats(initialized_space: UserWorkerSpace):
     """Test worker space statistics."""
-    agent_bus = AgentBus()
-
-    space = UserWorkerSpace(
-        user_id=test_user.id,
-        project_id=str(test_project.id),
-        db=db_session,
-        redis=None,
-        qdrant=None,
-        agent_bus=agent_bus,
-    )
-
-    await space.initialize()
-
-    stats = await space.get_agent_stats()
-    assert stats["user_id"] == str(test_user.id)
-    assert stats["project_id"] == str(test_project.id)
+    stats = await initialized_space.get_agent_stats()
+    assert stats["user_id"] == str(initialized_space.user_id)
+    assert stats["project_id"] == initialized_space.project_id
     assert stats["initialized"] is True
-    assert stats["active_agents"] == len(test_agents_fixture)
+    assert stats["active_agents"] == 2
     assert "agent_ids" in stats
 
 
 @pytest.mark.asyncio
 async def test_user_worker_space_health_check(
-    db_session: AsyncSession, test_user, test_project, test_agents_fixture
+    make_space, initialized_space: UserWorkerSpace
 ):
     """Test worker space health check."""
-    agent_bus = AgentBus()
-
-    space = UserWorkerSpace(
-        user_id=test_user.id,
-        project_id=str(test_project.id),
-        db=db_session,
-        redis=None,
-        qdrant=None,
-        agent_bus=agent_bus,
-    )
-
+    space = make_space()
     assert not space.is_healthy()
 
-    await space.initialize()
-    assert space.is_healthy()
-
-    await space.cleanup()
-    assert not space.is_healthy()
+    assert initialized_space.is_healthy()
 
 
 @pytest.mark.asyncio
-async def test_worker_space_manager_get_or_create(db_session: AsyncSession, test_user, test_agents_fixture):
-    """Test worker space manager get or create."""
-    manager = WorkerSpaceManager()
+@pytest.mark.parametrize(
+    "other_user,project_id,expect_same",
+    [
+        (False, "project1", True),
+        (False, "project2", False),
+        (True, "project1", False),
+    ],
+    ids=["same", "other_project", "other_user"],
+)
+async def test_worker_space_manager_get_or_create(
+    manager: WorkerSpaceManager,
+    db_session: AsyncSession,
+    test_user,
+    test_agents_fixture,
+    other_user,
+    project_id,
+    expect_same,
+):
+    """Test get or create returns one space per (user, project) pair."""
+    user_id = OTHER_USER_ID if other_user else test_user.id
 
-    # Create space
     space1 = await manager.get_or_create(
         user_id=test_user.id,
         project_id="project1",
@@ -206,42 +290,29 @@ async def test_worker_space_manager_get_or_create(db_session: AsyncSession, test
         redis=None,
         qdrant=None,
     )
-
     assert space1.initialized
 
-    # Get same space
     space2 = await manager.get_or_create(
-        user_id=test_user.id,
-        project_id="project1",
+        user_id=user_id,
+        project_id=project_id,
         db=db_session,
         redis=None,
         qdrant=None,
     )
 
-    assert space1 is space2
-
-    # Create different project space
-    space3 = await manager.get_or_create(
-        user_id=test_user.id,
-        project_id="project2",
-        db=db_session,
-        redis=None,
-        qdrant=None,
-    )
-
-    assert space1 is not space3
-    assert manager.get_user_project_count(test_user.id) == 2
+    assert (space1 is space2) is expect_same
+    assert space2.user_id == user_id
+    assert await manager.get(user_id, project_id) is space2
 
 
 @pytest.mark.asyncio
 async def test_worker_space_manager_rebinds_db_session(
+    manager: WorkerSpaceManager,
     db_session: AsyncSession,
     test_user,
     test_agents_fixture,
 ):
     """Cached workspace must use current request DB session."""
-    manager = WorkerSpaceManager()
-
     space1 = await manager.get_or_create(
         user_id=test_user.id,
         project_id="project-rebind",
@@ -267,10 +338,10 @@ async def test_worker_space_manager_rebinds_db_session(
 
 
 @pytest.mark.asyncio
-async def test_worker_space_manager_remove(db_session: AsyncSession, test_user, test_agents_fixture):
+async def test_worker_space_manager_remove(
+    manager: WorkerSpaceManager, db_session: AsyncSession, test_user, test_agents_fixture
+):
     """Test worker space manager remove."""
-    manager = WorkerSpaceManager()
-
     space = await manager.get_or_create(
         user_id=test_user.id,
         project_id="project1",
@@ -291,49 +362,10 @@ async def test_worker_space_manager_remove(db_session: AsyncSession, test_user,
 
 
 @pytest.mark.asyncio
-@pytest.mark.xfail(reason="WorkerSpaceManager stats needs refactoring")
-async def test_worker_space_manager_user_isolation(
-    db_session: AsyncSession, test_user, test_agents_fixture
+async def test_worker_space_manager_stats(
+    manager: WorkerSpaceManager, db_session: AsyncSession, test_user, test_agents_fixture
 ):
-    """Test worker space isolation between users."""
-    user2 = User(email="test2@example.com")
-    db_session.add(user2)
-    await db_session.commit()
-    await db_session.refresh(user2)
-
-    manager = WorkerSpaceManager()
-
-    space1 = await manager.get_or_create(
-        user_id=test_user.id,
-        project_id="project1",
-        db=db_session,
-        redis=None,
-        qdrant=None,
-    )
-
-    space2 = await manager.get_or_create(
-        user_id=user2.id,
-        project_id="project1",
-        db=db_session,
-        redis=None,
-        qdrant=None,
-    )
-
-    # Should be different spaces
-    assert space1 is not space2
-    assert space1.user_id != space2.user_id
-
-    # Stats should be separate
-    stats = manager.get_stats()
-    assert stats["active_spaces"] == 2
-
-
-@pytest.mark.asyncio
-@pytest.mark.xfail(reason="WorkerSpaceManager stats needs refactoring")
-async def test_worker_space_manager_stats(db_session: AsyncSession, test_user, test_agents_fixture):
     """Test worker space manager statistics."""
-    manager = WorkerSpaceManager()
-
     await manager.get_or_create(
         user_id=test_user.id,
         project_id="project1",
@@ -348,13 +380,10 @@ async def test_worker_space_manager_stats(db_session: AsyncSession, test_user, t
 
 
 @pytest.mark.asyncio
-@pytest.mark.xfail(reason="WorkerSpaceManager cleanup needs refactoring")
 async def test_worker_space_manager_cleanup_all(
-    db_session: AsyncSession, test_user, test_agents_fixture
+    manager: WorkerSpaceManager, db_session: AsyncSession, test_user, test_agents_fixture
 ):
     """Test worker space manager cleanup all."""
-    manager = WorkerSpaceManager()
-
     await manager.get_or_create(
         user_id=test_user.id,
         project_id="project1",
@@ -23,7 +23,7 @@ class TestV020PerProjectAgents:
     """Тесты для per-project agent endpoints."""
     
     @pytest.mark.asyncio
-    @pytest.mark.xfail(reason="Agent creation endpoint needs refactoring")
+    @pytest.mark.xfail(reason="Agent creation endpoint needs refactoring", run=False)
     async def test_create_agent_in_project(
         self,
         client: AsyncClient,
@@ -129,7 +129,7 @@ class TestV020PerProjectAgents:
         assert data["total"] >= 1
     
     @pytest.mark.asyncio
-    @pytest.mark.xfail(reason="Project detail endpoint needs refactoring")
+    @pytest.mark.xfail(reason="Project detail endpoint needs refactoring", run=False)
     async def test_get_project(
         self,
         client: AsyncClient,